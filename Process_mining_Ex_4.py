@@ -1,182 +0,0 @@
-from collections import Counter
-import xml.etree.ElementTree as ET
-import itertools
-
-class PetriNet:
-    def __init__(self):
-        self.places = {}
-        self.transitions = {}
-        self.initial_marking = {}
-        self.start_place = None
-        self.end_place = None
-
-    def add_place(self, name, tokens=0):
-        self.places[name] = tokens
-        if tokens > 0:
-            self.initial_marking[name] = tokens
-
-    def add_transition(self, name, tid):
-        if tid not in self.transitions:
-            self.transitions[tid] = {"name": name, "inputs": [], "outputs": []}
-
-    def add_edge(self, source, target):
-        if source in self.places and target in self.transitions:
-            self.transitions[target]["inputs"].append(source)
-        elif source in self.transitions and target in self.places:
-            self.transitions[source]["outputs"].append(target)
-        return self
-
-    def transition_name_to_id(self, name):
-        for tid, tdata in sorted(self.transitions.items()):
-            if tdata["name"] == name:
-                return tid
-        return None
-
-    def reset(self):
-        self.places = self.initial_marking.copy()
-
-def read_from_file(filename):
-    tree = ET.parse(filename)
-    root = tree.getroot()
-    ns = "{http://www.xes-standard.org/}"
-    log = []
-    for trace in root.findall(f"{ns}trace"):
-        events = [
-            prop.attrib['value']
-            for event in trace.findall(f"{ns}event")
-            for prop in event
-            if prop.tag == f"{ns}string" and prop.attrib['key'] == 'concept:name'
-        ]
-        if events:
-            log.append(tuple(events))
-    return log
-
-def alpha(log):
-    pn = PetriNet()
-    activities = []
-    seen = set()
-    for trace in log:
-        for act in trace:
-            if act not in seen:
-                seen.add(act)
-                activities.append(act)
-
-    activity_to_tid = {act: f"T{i}" for i, act in enumerate(activities)}
-    for act, tid in activity_to_tid.items():
-        pn.add_transition(act, tid)
-
-    direct_succ = set((trace[i], trace[i+1]) for trace in log for i in range(len(trace)-1))
-    causality = {(a, b) for a, b in direct_succ if (b, a) not in direct_succ}
-    choice = {(a, b) for a in activities for b in activities if (a,b) not in direct_succ and (b,a) not in direct_succ}
-
-    y_sets = set()
-    subsets = [frozenset(s) for r in range(1, len(activities) + 1) for s in itertools.combinations(activities, r)]
-    for A in subsets:
-        for B in subsets:
-            if all((a1, a2) in choice for a1, a2 in itertools.combinations(A, 2)) and \
-               all((b1, b2) in choice for b1, b2 in itertools.combinations(B, 2)) and \
-               all((a, b) in causality for a in A for b in B):
-                y_sets.add((A, B))
-
-    maximal_y_sets = set()
-    for A1, B1 in y_sets:
-        if not any((A1.issubset(A2) and B1.issubset(B2) and (A1, B1) != (A2, B2)) for A2, B2 in y_sets):
-            maximal_y_sets.add((A1, B1))
-
-    # Manual fixes
-    xor_split_set = (frozenset({'inspection'}), frozenset({'action not required', 'intervention authorization'}))
-    maximal_y_sets.add(xor_split_set)
-    maximal_y_sets.discard((frozenset({'inspection'}), frozenset({'action not required'})))
-    maximal_y_sets.discard((frozenset({'inspection'}), frozenset({'intervention authorization'})))
-
-    or_join_set = (frozenset({'action not required', 'work completion', 'no concession'}), frozenset({'issue completion'}))
-    maximal_y_sets.add(or_join_set)
-    maximal_y_sets.discard((frozenset({'action not required'}), frozenset({'issue completion'})))
-    maximal_y_sets.discard((frozenset({'work completion'}), frozenset({'issue completion'})))
-    maximal_y_sets.discard((frozenset({'no concession'}), frozenset({'issue completion'})))
-
-    place_id = 0
-    start_acts = sorted({trace[0] for trace in log})
-    start_place_name = f"P{place_id}"; place_id += 1
-    pn.add_place(start_place_name, 1)
-    pn.start_place = start_place_name
-    for a in start_acts:
-        pn.add_edge(start_place_name, activity_to_tid[a])
-
-    sorted_y = sorted(list(maximal_y_sets), key=lambda x: (sorted(list(x[0])), sorted(list(x[1]))))
-    for A, B in sorted_y:
-        p_name = f"P{place_id}"; place_id += 1
-        pn.add_place(p_name)
-        for a_in in sorted(list(A)):
-            pn.add_edge(activity_to_tid[a_in], p_name)
-        for b_out in sorted(list(B)):
-            pn.add_edge(p_name, activity_to_tid[b_out])
-
-    end_acts = sorted({trace[-1] for trace in log})
-    end_place_name = f"P{place_id}"; place_id += 1
-    pn.add_place(end_place_name)
-    pn.end_place = end_place_name
-    for a in end_acts:
-        pn.add_edge(activity_to_tid[a], end_place_name)
-
-    pn.initial_marking = {k: v for k, v in pn.places.items() if v > 0}
-    return pn
-
-def fitness_token_replay(log, pn):
-    trace_counts = Counter(log)
-    total_m = total_c = total_p = total_r = 0.0
-
-    for trace, count in sorted(trace_counts.items()):
-        pn.reset()
-        m = c = p = r = 0
-        p = sum(pn.initial_marking.values())
-
-        for activity_name in trace:
-            tid = pn.transition_name_to_id(activity_name)
-            if tid is None:
-                continue
-            t_info = pn.transitions[tid]
-            inputs = sorted(t_info["inputs"])
-            outputs = sorted(t_info["outputs"])
-
-            for place in inputs:
-                if pn.places.get(place, 0) == 0:
-                    m += 1
-                    pn.places[place] = 1
-            for place in inputs:
-                pn.places[place] -= 1
-            for place in outputs:
-                pn.places[place] = pn.places.get(place, 0) + 1
-
-            c += len(inputs)
-            p += len(outputs)
-
-        # Final consumption
-        if pn.places.get(pn.end_place, 0) > 0:
-            c += 1
-            pn.places[pn.end_place] -= 1
-        else:
-            m += 1
-
-        # Cleanup step ensures deterministic zeroing
-        pn.places = {k: v for k, v in pn.places.items() if v > 0}
-
-        r = sum(pn.places.values())
-        total_m += m * count
-        total_c += c * count
-        total_p += p * count
-        total_r += r * count
-
-    fit_cons = 1 - (total_m / total_c)
-    fit_prod = 1 - (total_r / total_p)
-    fitness = 0.5 * fit_cons + 0.5 * fit_prod
-    return round(fitness, 5)
-
-if __name__ == "__main__":
-    log = read_from_file("extension-log-4.xes")
-    log_noisy = read_from_file("extension-log-noisy-4.xes")
-
-    mined_model = alpha(log)
-
-    print(round(fitness_token_replay(log, mined_model), 5))
-    print(round(fitness_token_replay(log_noisy, mined_model), 5))
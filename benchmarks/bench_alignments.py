@@ -0,0 +1,76 @@
+"""Alignment conformance: A* states and time against plain Dijkstra (h = 0).
+
+Runs on the bundled noisy log and on noisy logs generated from random block
+nets; every variant is aligned once, so the variant count drives the cost.
+First checks that traces which fit a net with output-less transitions (as
+alpha mines from noisy logs) align at cost 0; exits with status 1 if not.
+
+    python benchmarks/bench_alignments.py [--activities 10 20 40] [--workers W]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.alignments import Aligner, fitness_alignments
+from process_mining.log_generator import block_net, generate_traces
+from process_mining.Process_mining_Ex_4 import alpha, fitness_token_replay, read_from_file
+
+
+def search_stats(aligner, variants):
+    states = 0
+    start = time.perf_counter()
+    for trace in variants:
+        states += aligner.align(trace).states
+    return states, time.perf_counter() - start
+
+
+def check_sink_transitions():
+    # alpha gives a0 no output place here; its token is consumed, not moved on
+    log = [("a0", "a1", "a0", "a1"), ("a0", "a1", "a1", "a1"), ("a0", "a1")]
+    model = alpha(log)
+    aligner = Aligner(model)
+    for trace in set(log):
+        alignment = aligner.align(trace)
+        if fitness_token_replay([trace], model) == 1.0 and (alignment is None or alignment.cost):
+            print(f"FAIL: {trace} fits the net but aligns as {alignment}")
+            sys.exit(1)
+
+
+def compare(name, model, log, workers):
+    variants = set(log)
+    astar = Aligner(model, max_states=10**7)
+    dijkstra = Aligner(model, max_states=10**7)
+    dijkstra._heuristic = lambda marking, unknown, known, label_dist: 0
+    a_states, a_time = search_stats(astar, variants)
+    d_states, d_time = search_stats(dijkstra, variants)
+    start = time.perf_counter()
+    fitness, skipped = fitness_alignments(log, model, workers=workers)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22}{len(variants):>8}{a_states:>12,}{a_time:>9.2f} s{d_states:>12,}{d_time:>9.2f} s"
+          f"{fitness:>9}{fitness_token_replay(log, model):>9}{elapsed:>9.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--activities", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--traces", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    check_sink_transitions()
+    print(f"{'log':<22}{'variants':>8}{'A* states':>12}{'A*':>11}{'h=0 states':>12}{'h=0':>11}"
+          f"{'align':>9}{'token':>9}{'parallel':>11}")
+    model = alpha(read_from_file(os.path.join(ROOT, "extension-log-4.xes")))
+    compare("extension-noisy", model, read_from_file(os.path.join(ROOT, "extension-log-noisy-4.xes")),
+            args.workers)
+    for n in args.activities:
+        net = block_net(n, seed=n)
+        log = list(generate_traces(net, args.traces, variants=200, noise=0.5, seed=n))
+        compare(f"block net, {n} acts", net, log, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Runtime of Alpha miner place discovery as the number of activities grows.
+
+Footprints come from random traces of a block-structured process (sequences,
+XOR choices and parallel blocks). The old powerset search is only run up to
+--max-powerset activities, past that it does not finish in reasonable time.
+The last column is the extended (short loop / non-free-choice) mode including
+building its footprint from the traces.
+
+    python benchmarks/bench_alpha_places.py [--max-powerset 10]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.alpha_places import extended_places, maximal_pairs
+from process_mining.footprint import Footprint
+
+
+def powerset_pairs(activities, causality, choice):
+    # step 3 + 4 as they were in Process_mining_Ex_4.alpha
+    y_sets = set()
+    subsets = [frozenset(s) for r in range(1, len(activities) + 1) for s in itertools.combinations(activities, r)]
+    for A in subsets:
+        for B in subsets:
+            if all((a1, a2) in choice for a1, a2 in itertools.combinations(A, 2)) and \
+               all((b1, b2) in choice for b1, b2 in itertools.combinations(B, 2)) and \
+               all((a, b) in causality for a in A for b in B):
+                y_sets.add((A, B))
+    return {(A1, B1) for A1, B1 in y_sets
+            if not any(A1 <= A2 and B1 <= B2 and (A1, B1) != (A2, B2) for A2, B2 in y_sets)}
+
+
+def block_process(n, rng):
+    blocks, i = [], 0
+    while i < n:
+        kind = rng.choice(["seq", "xor", "and"])
+        width = 1 if kind == "seq" else min(rng.randint(2, 4), n - i)
+        blocks.append((kind, [f"a{j}" for j in range(i, i + width)]))
+        i += width
+    return blocks
+
+
+def play(blocks, rng):
+    trace = []
+    for kind, acts in blocks:
+        if kind == "xor":
+            trace.append(rng.choice(acts))
+        elif kind == "and":
+            trace.extend(rng.sample(acts, len(acts)))
+        else:
+            trace.extend(acts)
+    return trace
+
+
+def sample_log(n, traces=500, seed=0):
+    rng = random.Random(seed)
+    blocks = block_process(n, rng)
+    return [play(blocks, rng) for _ in range(traces)]
+
+
+def footprint(log):
+    activities = sorted({a for t in log for a in t})
+    direct_succ = {(t[i], t[i + 1]) for t in log for i in range(len(t) - 1)}
+    causality = {(a, b) for a, b in direct_succ if (b, a) not in direct_succ}
+    choice = {(a, b) for a in activities for b in activities
+              if (a, b) not in direct_succ and (b, a) not in direct_succ}
+    return activities, causality, choice
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-powerset", type=int, default=10)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 6, 8, 10, 15, 20, 40, 60, 80])
+    args = parser.parse_args()
+    print(f"{'activities':>10}{'places':>8}{'powerset s':>12}{'clique s':>12}{'extended s':>12}")
+    for n in args.sizes:
+        log = sample_log(n)
+        fp = footprint(log)
+        pairs, fast = timed(maximal_pairs, *fp)
+        old = "-"
+        if n <= args.max_powerset:
+            expected, slow = timed(powerset_pairs, *fp)
+            assert expected == pairs
+            old = f"{slow:.4f}"
+        _, extended = timed(lambda: extended_places(Footprint.from_traces(log, extended=True)))
+        print(f"{n:>10}{len(pairs):>8}{old:>12}{fast:>12.4f}{extended:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
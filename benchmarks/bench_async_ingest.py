@@ -0,0 +1,71 @@
+"""Rows per second of the asyncio ingestion stage feeding IncrementalDFG.
+
+A synthetic job;case;user;timestamp feed (1% malformed rows) is ingested
+from a file and from a pipe written by another thread.
+
+    python benchmarks/bench_async_ingest.py [--rows 1000000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.async_ingest import dfg_sink, ingest, ingest_file, pipe_chunks
+from process_mining.incremental_dfg import IncrementalDFG
+
+
+def write_feed(path, rows, rng):
+    start = datetime(2019, 9, 9)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            if rng.random() < 0.01:
+                f.write("broken row\n")
+                continue
+            ts = (start + timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S')
+            f.write(f"Task_{rng.choice('ABCDEFGH')};case_{rng.randrange(rows // 10 + 1)};"
+                    f"user_{rng.randrange(20)};{ts}\n")
+
+
+async def from_pipe(path, sink):
+    read_fd, write_fd = os.pipe()
+
+    def writer():
+        with open(path, "rb") as src, os.fdopen(write_fd, "wb") as dst:
+            while chunk := src.read(1 << 16):
+                dst.write(chunk)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    with os.fdopen(read_fd, "rb") as pipe:
+        stats = await ingest(pipe_chunks(pipe), sink)
+    thread.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feed.csv")
+        write_feed(path, args.rows, random.Random(0))
+        for name, run in (("file", lambda sink: ingest_file(path, sink)),
+                          ("pipe", lambda sink: from_pipe(path, sink))):
+            dfg = IncrementalDFG()
+            start = time.perf_counter()
+            stats = asyncio.run(run(dfg_sink(dfg)))
+            elapsed = time.perf_counter() - start
+            print(f"{name:<6}{stats.rows:>10,} rows {stats.malformed_rows:>7,} malformed"
+                  f"{elapsed:>8.2f} s {stats.rows / elapsed:>12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
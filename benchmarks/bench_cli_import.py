@@ -0,0 +1,65 @@
+"""Start-up cost of the pm command line.
+
+Runs short-lived processes the way batch jobs do and prints the best wall
+time of: a bare interpreter, `import pm_cli`, `pm --help` and `pm parse` on
+the bundled log, plus the heavy modules each one ends up importing. Exits
+with status 1 when importing pm_cli takes more than --budget ms over the
+bare interpreter or loads any of the heavy modules, so it can guard CI.
+
+    python benchmarks/bench_cli_import.py [--repeat N] [--budget MS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("numpy", "multiprocessing", "xml.etree.ElementTree", "process_mining.Process_mining_Ex_4",
+         "process_mining.event_log", "process_mining.alignments", "process_mining.performance")
+LOG = os.path.join(ROOT, "extension-log-4.xes")
+
+
+def run(code, repeat):
+    # best wall time of a fresh interpreter running code, and its modules
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    out = subprocess.run([sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sys.modules), file=sys.stderr)"],
+                         cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = set(out.stderr.split())
+    return min(times), [m for m in HEAVY if m in modules]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=15.0, help="ms allowed for import pm_cli")
+    args = parser.parse_args()
+
+    cases = [
+        ("python", "pass"),
+        ("import pm_cli", "from process_mining import pm_cli"),
+        ("pm --help", "from process_mining import pm_cli\ntry:\n    pm_cli.main(['--help'])\nexcept SystemExit:\n    pass"),
+        ("pm parse", f"from process_mining import pm_cli\npm_cli.main(['parse', {LOG!r}])"),
+        ("pm fitness", f"from process_mining import pm_cli\npm_cli.main(['fitness', '--mine', {LOG!r}, {LOG!r}])"),
+    ]
+    results = {}
+    for name, code in cases:
+        results[name] = run(code, args.repeat)
+    base = results["python"][0]
+    for name, (seconds, heavy) in results.items():
+        extra = "" if name == "python" else f" (+{(seconds - base) * 1e3:.1f} ms)"
+        print(f"{name:<16}{seconds * 1e3:>8.1f} ms{extra:<14}{' '.join(heavy)}")
+
+    overhead = (results["import pm_cli"][0] - base) * 1e3
+    if overhead > args.budget or results["import pm_cli"][1]:
+        print(f"FAIL: import pm_cli costs {overhead:.1f} ms and loads {results['import pm_cli'][1] or 'nothing heavy'}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
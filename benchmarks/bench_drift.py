@@ -0,0 +1,61 @@
+"""Per-trace cost and detection delay of drift.DriftDetector.
+
+A stream of --traces traces is played out from one random block net and,
+from the middle on, from another one over the same activities (both with
+noise). For a few window sizes the detector prints the time per trace,
+where it placed the drift and any false alarms; a stream without a change
+is run as a check that nothing is flagged.
+
+    python benchmarks/bench_drift.py [--traces N] [--activities N]
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.drift import DriftDetector
+from process_mining.log_generator import block_net, generate_traces
+
+
+def run(traces, window):
+    detector = DriftDetector(window)
+    start = time.perf_counter()
+    drifts = detector.add_traces(traces)
+    return (time.perf_counter() - start) / len(traces), drifts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--traces", type=int, default=20_000)
+    parser.add_argument("--activities", type=int, default=15)
+    args = parser.parse_args()
+    half = args.traces // 2
+    before = block_net(args.activities, seed=1)
+    after = block_net(args.activities, seed=2)
+    stable = list(generate_traces(before, args.traces, noise=0.2, seed=3))
+    changed = list(itertools.chain(generate_traces(before, half, noise=0.2, seed=3),
+                                   generate_traces(after, args.traces - half, noise=0.2, seed=4)))
+
+    print(f"{args.traces} traces, change at trace {half}")
+    print(f"{'window':>8}{'us/trace':>10}{'drift at':>10}{'detected':>10}{'false':>7}{'stable':>8}")
+    for window in (50, 200, 1000, 4000):
+        per_trace, drifts = run(changed, window)
+        hits = [d for d in drifts if d.detected_at >= half]
+        false = len(drifts) - len(hits)
+        _, stable_drifts = run(stable, window)
+        first = hits[0] if hits else None
+        print(f"{window:>8}{per_trace * 1e6:>10.1f}"
+              f"{first.trace if first else '-':>10}{first.detected_at if first else '-':>10}"
+              f"{false:>7}{len(stable_drifts):>8}")
+    if hits:
+        print("most changed edges:")
+        for a, b, p_ref, p_recent in hits[0].edges:
+            print(f"  {a} -> {b}: {p_ref:.3f} -> {p_recent:.3f}")
+
+
+if __name__ == "__main__":
+    main()
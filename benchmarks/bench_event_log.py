@@ -0,0 +1,57 @@
+"""Memory and pass cost of the columnar EventLog against the per-event dicts.
+
+    python benchmarks/bench_event_log.py [xes file]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining import Process_mining_Ex_2 as ex2
+from process_mining import Process_mining_Ex_4 as ex4
+from process_mining.event_log import EventLog
+
+
+def measure(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def allocated(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "extension-log-4.xes")
+    log_dict, dict_bytes = allocated(ex2.read_from_file, path)
+    log, log_bytes = allocated(EventLog.from_xes, path)
+    traces = ex4.read_from_file(path)
+    print(f"{os.path.basename(path)}: {len(log)} traces, {log.num_events} events, {log.num_variants} variants")
+    print(f"memory   dict log {dict_bytes / 1024:10.1f} KiB   EventLog {log_bytes / 1024:10.1f} KiB")
+
+    _, before = measure(ex2.dependency_graph_file, log_dict)
+    _, after = measure(ex2.dependency_graph_file, log)
+    print(f"dependency_graph_file  {before * 1e3:8.3f} ms -> {after * 1e3:8.3f} ms")
+
+    net, before = measure(ex4.alpha, traces)
+    _, after = measure(ex4.alpha, log)
+    print(f"alpha                  {before * 1e3:8.3f} ms -> {after * 1e3:8.3f} ms")
+
+    _, before = measure(ex4.fitness_token_replay, traces, net)
+    _, after = measure(ex4.fitness_token_replay, log, net)
+    print(f"fitness_token_replay   {before * 1e3:8.3f} ms -> {after * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
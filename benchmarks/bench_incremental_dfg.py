@@ -0,0 +1,64 @@
+"""Cost of adding a 10k-event batch to IncrementalDFG graphs of growing size.
+
+Events are interleaved over --cases concurrently open cases; every case is
+closed after a random length, so the set of open cases stays bounded.
+
+    python benchmarks/bench_incremental_dfg.py [--sizes 10000 100000 ...]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.incremental_dfg import IncrementalDFG
+
+ACTIVITIES = [f"activity {i}" for i in range(40)]
+
+
+def event_stream(rng, cases):
+    open_cases = list(range(cases))
+    remaining = {c: rng.randint(3, 30) for c in open_cases}
+    next_case = cases
+    while True:
+        i = rng.randrange(len(open_cases))
+        case = open_cases[i]
+        yield case, rng.choice(ACTIVITIES), remaining[case] == 1
+        remaining[case] -= 1
+        if not remaining[case]:
+            del remaining[case]
+            open_cases[i] = next_case
+            remaining[next_case] = rng.randint(3, 30)
+            next_case += 1
+
+
+def add(dfg, stream, n):
+    for _ in range(n):
+        case, activity, last = next(stream)
+        dfg.add_event(case, activity)
+        if last:
+            dfg.close_case(case)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--cases", type=int, default=10_000)
+    args = parser.parse_args()
+    print(f"{'graph events':>14}{'batch ms':>10}{'us/event':>10}")
+    for size in args.sizes:
+        stream = event_stream(random.Random(0), args.cases)
+        dfg = IncrementalDFG()
+        add(dfg, stream, size)
+        start = time.perf_counter()
+        add(dfg, stream, args.batch)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>14,}{elapsed * 1e3:>10.2f}{elapsed / args.batch * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
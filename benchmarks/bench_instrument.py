@@ -0,0 +1,67 @@
+"""Cost of the instrumentation hooks, disabled and enabled, on parse/mine/replay.
+
+Prints the per-call cost of a disabled timer()/count() and the pipeline time
+with instrumentation off, on, and on with the sampling profiler; the report
+of the last run is written as JSON.
+
+    python benchmarks/bench_instrument.py [--repeat N] [--report report.json]
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining import instrument
+from process_mining.event_log import EventLog
+from process_mining.Process_mining_Ex_4 import alpha, fitness_token_replay
+from process_mining.xes_stream import read_traces
+
+
+def pipeline():
+    model = alpha(read_traces(os.path.join(ROOT, "extension-log-4.xes")))
+    noisy = EventLog.from_xes(os.path.join(ROOT, "extension-log-noisy-4.xes"))
+    return fitness_token_replay(noisy, model)
+
+
+def best(repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pipeline()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--report", default=None)
+    args = parser.parse_args()
+
+    n = 1_000_000
+    hook = timeit.timeit("with timer('x'): pass", globals={"timer": instrument.timer}, number=n) / n
+    counter = timeit.timeit("count('x', 1)", globals={"count": instrument.count}, number=n) / n
+    print(f"disabled timer: {hook * 1e9:.0f} ns, disabled count: {counter * 1e9:.0f} ns")
+
+    off = best(args.repeat)
+    instrument.enable()
+    on = best(args.repeat)
+    instrument.disable()
+    instrument.reset()
+    instrument.enable(sample_interval=0.001)
+    sampled = best(args.repeat)
+    instrument.disable()
+    print(f"pipeline off {off:.4f} s, on {on:.4f} s ({on / off - 1:+.1%}), "
+          f"sampling {sampled:.4f} s ({sampled / off - 1:+.1%})")
+    for name, stage in instrument.report()["stages"].items():
+        print(f"  {name:<18}{stage['calls']:>6}{stage['total_s']:>10.4f} s")
+    if args.report:
+        instrument.write_report(args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Mining a model versus loading it from a model_io file.
+
+For random block nets of a few sizes, prints the time to mine the net with
+alpha from its sample log, to write it with dump_petri_net and to read it
+back with load_compiled / load_petri_net, and the file size. The bundled
+noisy log is then written both as a full EventLog file and as a variant
+log.
+
+    python benchmarks/bench_model_io.py [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.event_log import EventLog
+from process_mining.log_cache import dump_event_log, load_event_log
+from process_mining.log_generator import generate_traces
+from process_mining.model_io import dump_petri_net, dump_variants, load_compiled, load_petri_net, load_variants
+from process_mining.Process_mining_Ex_4 import alpha
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def sample_log(activities, seed=0):
+    # a sequence with XOR blocks of width 2, every directly-follows pair seen
+    rng = random.Random(seed)
+    names = [f"a{i}" for i in range(activities)]
+    blocks = [names[i:i + 2] for i in range(0, activities, 2)]
+    return [tuple(rng.choice(block) for block in blocks) for _ in range(20 * activities)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "model.pmnet")
+
+    print(f"{'activities':>10}{'mine':>10}{'dump':>10}{'compiled':>10}{'petrinet':>10}{'bytes':>9}")
+    for activities in (20, 100, 400):
+        log = sample_log(activities)
+        mine, pn = best(lambda: alpha(log), args.repeat)
+        dump, _ = best(lambda: dump_petri_net(pn, path), args.repeat)
+        compiled, _ = best(lambda: load_compiled(path), args.repeat)
+        petrinet, _ = best(lambda: load_petri_net(path), args.repeat)
+        print(f"{activities:>10}{mine * 1e3:>8.2f}ms{dump * 1e3:>8.2f}ms"
+              f"{compiled * 1e3:>8.2f}ms{petrinet * 1e3:>8.2f}ms{os.path.getsize(path):>9}")
+
+    noisy = EventLog.from_xes(os.path.join(ROOT, "extension-log-noisy-4.xes"))
+    big = EventLog.from_traces(generate_traces(alpha(noisy.variant_counter()), 200_000, noise=0.1))
+    for name, log in (("noisy", noisy), ("200k traces", big)):
+        full, variants = os.path.join(tmp, "full.pmlog"), os.path.join(tmp, "variants.pmlog")
+        dump_event_log(log, full)
+        dump_variants(log, variants)
+        load_full, _ = best(lambda: load_event_log(full), args.repeat)
+        load_var, _ = best(lambda: load_variants(variants).variant_counter(), args.repeat)
+        print(f"{name}: {log.num_variants} variants; full log {os.path.getsize(full):,} bytes "
+              f"({load_full * 1e3:.2f} ms), variant log {os.path.getsize(variants):,} bytes "
+              f"({load_var * 1e3:.2f} ms incl. variant_counter)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Scaling of fitness_token_replay_parallel with the number of workers.
+
+Uses the noisy variant log from bench_replay_numpy.py.
+
+    python benchmarks/bench_parallel_replay.py [--variants V] [--workers 1 2 4 ...]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_replay_numpy import noisy
+from process_mining.event_log import EventLog
+from process_mining.Process_mining_Ex_4 import alpha, fitness_token_replay, read_from_file
+from process_mining.parallel_replay import fitness_token_replay_parallel
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--variants", type=int, default=400_000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, 16, 32, cpus} & set(range(1, cpus + 1))))
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    base = read_from_file(os.path.join(ROOT, "extension-log-4.xes"))
+    model = alpha(base)
+    log = EventLog.from_traces(
+        noisy(rng.choice(base), rng) + noisy(rng.choice(base), rng) for _ in range(args.variants))
+    print(f"{len(log):,} traces, {log.num_variants:,} variants, {cpus} cpus")
+
+    start = time.perf_counter()
+    expected = fitness_token_replay(log, model)
+    serial = time.perf_counter() - start
+    print(f"{'serial':>8}{serial:>10.3f} s")
+    for workers in args.workers:
+        start = time.perf_counter()
+        fitness = fitness_token_replay_parallel(log, model, workers=workers,
+                                                chunk_size=args.chunk_size, min_variants=0)
+        elapsed = time.perf_counter() - start
+        assert fitness == expected
+        print(f"{workers:>8}{elapsed:>10.3f} s  speedup {serial / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Parallel chunked XES parsing against the serial readers.
+
+extension-log-4.xes is scaled up by repeating its traces; the result of every
+parallel run is checked against EventLog.from_xes.
+
+    python benchmarks/bench_parallel_xes.py [--scale N] [--workers W ...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_xes_stream import LOG, scale_log
+from process_mining.event_log import EventLog
+from process_mining.parallel_xes import read_event_log
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--chunk-mb", type=float, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scaled.xes")
+        scale_log(LOG, path, args.scale)
+        size = os.path.getsize(path) / 2**20
+        serial, serial_s = timed(EventLog.from_xes, path)
+        print(f"{size:.0f} MiB, {serial.num_events:,} events, {os.cpu_count()} cpus")
+        print(f"{'serial':>10}{serial_s:>10.3f} s")
+        for workers in sorted(set(args.workers)):
+            log, elapsed = timed(read_event_log, path, workers, int(args.chunk_mb * 2**20))
+            assert log.variant_counter() == serial.variant_counter() and log.case_ids == serial.case_ids
+            print(f"{workers:>10}{elapsed:>10.3f} s{serial_s / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
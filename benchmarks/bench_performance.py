@@ -0,0 +1,58 @@
+"""Throughput and memory of performance.analyze on a large columnar log.
+
+The EventLog of extension-log-noisy-4.xes is repeated --scale times (array
+concatenation, no parsing), then analyzed with a few chunk sizes; peak is
+the extra memory of the analysis on top of the log.
+
+    python benchmarks/bench_performance.py [--scale N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.event_log import EventLog
+from process_mining.performance import analyze
+
+
+def scaled(log, scale):
+    big = EventLog()
+    big.activities, big.activity_codes = log.activities, log.activity_codes
+    big.resources, big.resource_codes = log.resources, log.resource_codes
+    big.case_ids = log.case_ids * scale
+    for name in ("events", "timestamps", "costs", "event_resources"):
+        getattr(big, name).extend(getattr(log, name) * scale)
+    lengths = np.diff(np.frombuffer(log.offsets, dtype=np.int64))
+    big.offsets.extend(np.cumsum(np.tile(lengths, scale)).tolist())
+    return big
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=2000)
+    args = parser.parse_args()
+    log = scaled(EventLog.from_xes(os.path.join(ROOT, "extension-log-noisy-4.xes")), args.scale)
+    print(f"{log.num_events:,} events, {len(log):,} cases, arrays {log.nbytes() / 2**20:.0f} MiB")
+    for chunk in (1 << 16, 1 << 20, 1 << 22):
+        tracemalloc.start()
+        start = time.perf_counter()
+        stats = analyze(log, chunk_size=chunk)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"chunk {chunk:>9,}{elapsed:>9.2f} s{log.num_events / elapsed:>14,.0f} ev/s"
+              f"{peak / 2**20:>9.1f} MiB peak")
+    graph = stats.dependency_graph()
+    source, targets = next(iter(graph.items()))
+    target, timing = next(iter(targets.items()))
+    print(f"{source} -> {target}: {timing}")
+
+
+if __name__ == "__main__":
+    main()
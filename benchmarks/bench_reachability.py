@@ -0,0 +1,69 @@
+"""State-space exploration on mined and synthetic nets.
+
+The nets mined from the bundled logs are tiny; a synthetic net with
+--branches parallel chains of --length transitions each has
+(length + 1) ** branches reachable markings and shows throughput and memory
+on large state spaces.
+
+    python benchmarks/bench_reachability.py [--branches 6] [--length 9]
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.Process_mining_Ex_4 import PetriNet, alpha, read_from_file
+from process_mining.reachability import explore
+
+
+def parallel_net(branches, length):
+    pn = PetriNet()
+    pn.add_place("start", 1)
+    pn.add_place("end")
+    pn.add_transition("split", "split")
+    pn.add_transition("join", "join")
+    pn.add_edge("start", "split")
+    pn.add_edge("join", "end")
+    for b in range(branches):
+        places = [f"b{b}p{i}" for i in range(length + 1)]
+        for place in places:
+            pn.add_place(place)
+        pn.add_edge("split", places[0])
+        pn.add_edge(places[-1], "join")
+        for i in range(length):
+            tid = f"b{b}t{i}"
+            pn.add_transition(tid, tid)
+            pn.add_edge(places[i], tid)
+            pn.add_edge(tid, places[i + 1])
+    pn.end_place = "end"
+    return pn
+
+
+def report(name, pn, **kwargs):
+    start = time.perf_counter()
+    graph = explore(pn, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32}{len(graph):>10,} states {graph.num_arcs:>11,} arcs {elapsed:>8.2f} s"
+          f" {len(graph) / elapsed:>10,.0f} states/s  deadlocks {len(graph.deadlocks)}"
+          f"  unbounded {sorted(graph.unbounded)}  complete {graph.complete}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--branches", type=int, default=6)
+    parser.add_argument("--length", type=int, default=9)
+    parser.add_argument("--max-states", type=int, default=2_000_000)
+    args = parser.parse_args()
+    for name in ("extension-log-4.xes", "extension-log-noisy-4.xes"):
+        report(f"alpha({name})", alpha(read_from_file(os.path.join(ROOT, name))))
+    report(f"parallel {args.branches}x{args.length}", parallel_net(args.branches, args.length),
+           max_states=args.max_states, store_arcs=False)
+    print(f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
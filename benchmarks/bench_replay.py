@@ -0,0 +1,76 @@
+"""Events replayed per second by fitness_token_replay, before and after the
+indexed PetriNet.
+
+"before" is the replay loop as it was: a sorted scan per name lookup and
+sorting of every transition's inputs/outputs on each firing. Variants are
+not collapsed here, so every trace of the log is replayed.
+
+    python benchmarks/bench_replay.py [repeat]
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.Process_mining_Ex_4 import alpha, read_from_file
+
+
+def legacy_replay(trace, pn):
+    pn.reset()
+    m = c = 0
+    p = sum(pn.initial_marking.values())
+    for activity_name in trace:
+        tid = None
+        for t, tdata in sorted(pn.transitions.items()):
+            if tdata["name"] == activity_name:
+                tid = t
+                break
+        if tid is None:
+            continue
+        t_info = pn.transitions[tid]
+        inputs = sorted(t_info["inputs"])
+        outputs = sorted(t_info["outputs"])
+        for place in inputs:
+            if pn.places.get(place, 0) == 0:
+                m += 1
+                pn.places[place] = 1
+        for place in inputs:
+            pn.places[place] -= 1
+        for place in outputs:
+            pn.places[place] = pn.places.get(place, 0) + 1
+        c += len(inputs)
+        p += len(outputs)
+    if pn.places.get(pn.end_place, 0) > 0:
+        c += 1
+        pn.places[pn.end_place] -= 1
+    else:
+        m += 1
+    pn.places = {k: v for k, v in pn.places.items() if v > 0}
+    return m, c, p, sum(pn.places.values())
+
+
+def events_per_second(replay, log, repeat):
+    events = sum(len(t) for t in log) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for trace in log:
+            replay(trace)
+    return events / (time.perf_counter() - start)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    model = alpha(read_from_file(os.path.join(ROOT, "extension-log-4.xes")))
+    net = model.compile()
+    for name in ("extension-log-4.xes", "extension-log-noisy-4.xes"):
+        log = read_from_file(os.path.join(ROOT, name))
+        assert all(legacy_replay(t, model) == net.replay(t) for t in log)
+        before = events_per_second(lambda t: legacy_replay(t, model), log, repeat)
+        after = events_per_second(net.replay, log, repeat)
+        print(f"{name:<28}{before:>14,.0f} ev/s ->{after:>14,.0f} ev/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Memoized replay against fitness_token_replay.
+
+Runs on a noisy many-variant log built from extension-log-4.xes (7-place
+net) and on noisy logs of random block nets. For each it prints the best wall
+time of fitness_token_replay and of the memoized replay with a fresh cache
+(cold) and with the cache of the previous run (warm), and the cache counts.
+The memo wins once most steps are hits; noisy variants of a large net reach
+many markings only once, so there the cold run is slower than plain replay.
+
+    python benchmarks/bench_replay_memo.py [--variants V] [--activities 20 40 80]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_replay_numpy import noisy
+from process_mining.event_log import EventLog
+from process_mining.log_generator import block_net, generate_traces
+from process_mining.Process_mining_Ex_4 import alpha, fitness_token_replay, read_from_file
+from process_mining.replay_memo import TransitionCache, fitness_token_replay_memo
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def compare(name, log, model, repeat):
+    expected, serial = best_of(lambda: fitness_token_replay(log, model), repeat)
+    cache = TransitionCache(model)
+    result, cold = best_of(lambda: fitness_token_replay_memo(log, model, cache), 1)
+    assert result == expected
+    result, warm = best_of(lambda: fitness_token_replay_memo(log, model, cache), repeat)
+    assert result == expected
+    stats = cache.stats()
+    print(f"{name:<24}{log.num_variants:>8,}{serial:>9.3f} s{cold:>9.3f} s{warm:>9.3f} s"
+          f"{serial / warm:>8.2f}x{stats['states']:>9,}{stats['size']:>9,}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--variants", type=int, default=100_000)
+    parser.add_argument("--activities", type=int, nargs="+", default=[20, 40, 80])
+    parser.add_argument("--traces", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'log':<24}{'variants':>8}{'serial':>11}{'cold':>11}{'warm':>11}{'warm/ser':>9}"
+          f"{'states':>9}{'steps':>9}")
+    rng = random.Random(0)
+    base = read_from_file(os.path.join(ROOT, "extension-log-4.xes"))
+    log = EventLog.from_traces(
+        noisy(rng.choice(base), rng) + noisy(rng.choice(base), rng) for _ in range(args.variants))
+    compare("extension-log-4, noisy", log, alpha(base), args.repeat)
+    for n in args.activities:
+        net = block_net(n, seed=n)
+        log = EventLog.from_traces(generate_traces(net, args.traces, variants=2000, noise=0.5, seed=n))
+        compare(f"block net, {n} acts", log, net, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
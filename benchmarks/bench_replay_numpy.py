@@ -0,0 +1,66 @@
+"""Vectorized batch replay against fitness_token_replay on a large noisy log.
+
+Variants are made by adding noise (swaps, drops, duplicates) to the traces of
+extension-log-4.xes; the multiplicities are then spread so the log stands for
+--traces traces in total, the way EventLog stores repeated variants.
+
+    python benchmarks/bench_replay_numpy.py [--traces N] [--variants V]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining.event_log import EventLog
+from process_mining.Process_mining_Ex_4 import alpha, fitness_token_replay, read_from_file
+from process_mining.replay_numpy import fitness_token_replay_batch
+
+
+def noisy(trace, rng):
+    trace = list(trace)
+    for _ in range(rng.randint(0, 6)):
+        i = rng.randrange(len(trace))
+        op = rng.random()
+        if op < 0.3 and len(trace) > 1:
+            del trace[i]
+        elif op < 0.6:
+            trace.insert(i, trace[rng.randrange(len(trace))])
+        else:
+            j = rng.randrange(len(trace))
+            trace[i], trace[j] = trace[j], trace[i]
+    return tuple(trace)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--traces", type=int, default=5_000_000)
+    parser.add_argument("--variants", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    base = read_from_file(os.path.join(ROOT, "extension-log-4.xes"))
+    model = alpha(base)
+    log = EventLog.from_traces(noisy(rng.choice(base), rng) for _ in range(args.variants))
+    share, rest = divmod(max(args.traces - len(log), 0), log.num_variants)
+    for v in range(log.num_variants):
+        log.variant_counts[v] += share + (v < rest)
+    traces = sum(log.variant_counts)
+    print(f"{traces:,} traces, {log.num_variants:,} variants")
+
+    start = time.perf_counter()
+    serial = fitness_token_replay(log, model)
+    serial_s = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = fitness_token_replay_batch(log, model)
+    batch_s = time.perf_counter() - start
+    assert serial == batch
+    print(f"fitness_token_replay        {serial}  {serial_s:8.3f} s")
+    print(f"fitness_token_replay_batch  {batch}  {batch_s:8.3f} s  ({serial_s / batch_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Parse / mine / replay benchmark on synthetic XES logs, saved as JSON.
+
+A log is generated from a PetriNet (by default the model mined from
+extension-log-4.xes, with --activities a random block-structured net) and
+every stage is timed on it. Wall time is the best of --repeat runs, peak
+memory is measured in one more run under tracemalloc so tracing does not
+distort the timings. With --baseline the results are compared to an earlier
+JSON file and the run fails if a stage got slower than --tolerance allows.
+
+    python benchmarks/bench_suite.py [--traces N] [--variants V] [--noise P]
+        [--activities A] [--output results.json] [--baseline old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining import Process_mining_Ex_2 as ex2
+from process_mining import Process_mining_Ex_4 as ex4
+from process_mining.event_log import EventLog
+from process_mining.log_generator import block_net, generate_xes
+
+
+def measure(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args, path):
+    if args.activities:
+        model = block_net(args.activities, args.seed)
+    else:
+        model = ex4.alpha(ex4.read_from_file(os.path.join(ROOT, "extension-log-4.xes")))
+    events = generate_xes(path, model, args.traces, args.variants, args.noise, args.seed)
+    traces = ex4.read_from_file(path)
+    log = EventLog.from_traces(traces)
+    stages = {
+        "parse (Ex_2 read_from_file)": lambda: ex2.read_from_file(path),
+        "parse (Ex_4 read_from_file)": lambda: ex4.read_from_file(path),
+        "parse (EventLog.from_xes)": lambda: EventLog.from_xes(path),
+        "mine (alpha)": lambda: ex4.alpha(log),
+        "replay (fitness_token_replay)": lambda: ex4.fitness_token_replay(log, model),
+    }
+    results = {}
+    for name, fn in stages.items():
+        _, wall, peak = measure(fn, args.repeat)
+        results[name] = {"wall_s": round(wall, 6), "peak_bytes": peak,
+                         "events_per_s": round(events / wall) if wall else None}
+        print(f"{name:<32}{wall:>10.4f} s{peak / 2**20:>10.1f} MiB{events / wall:>14,.0f} ev/s")
+    return {
+        "meta": {"revision": git_revision(), "python": platform.python_version(),
+                 "machine": platform.machine(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "traces": args.traces, "variants": log.num_variants, "events": events,
+                 "activities": len(log.activities), "noise": args.noise, "seed": args.seed},
+        "stages": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    # stages slower than the baseline by more than tolerance (a fraction);
+    # differences under a millisecond are timer noise
+    slower = []
+    for name, stage in report["stages"].items():
+        old = baseline["stages"].get(name)
+        if old and stage["wall_s"] > old["wall_s"] * (1 + tolerance) + 0.001:
+            slower.append(name)
+        if old:
+            print(f"{name:<32}{stage['wall_s'] / old['wall_s']:>8.2f}x baseline")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--traces", type=int, default=10_000)
+    parser.add_argument("--variants", type=int, default=100)
+    parser.add_argument("--noise", type=float, default=0.1)
+    parser.add_argument("--activities", type=int, default=0, help="random block net instead of the bundled model")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run(args, os.path.join(tmp, "synthetic.xes"))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slower = compare(report, json.load(f), args.tolerance)
+        if slower:
+            sys.exit("slower than baseline: " + ", ".join(slower))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Prefix-tree replay against per-variant replay (fitness_token_replay).
+
+Prints, for the bundled logs and for noisy logs of random block nets, the
+number of firings per-variant replay does and the trie does (its edges), and
+the best wall time of both. The trie can only save the shared prefixes: its
+gain is bounded by the firing ratio.
+
+    python benchmarks/bench_trie_replay.py [--repeat N] [--activities 20 40 80]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from collections import Counter
+
+from process_mining.log_generator import block_net, generate_traces
+from process_mining.Process_mining_Ex_4 import alpha, fitness_token_replay, read_from_file
+from process_mining.trie_replay import build_trie, fitness_token_replay_trie
+
+
+def best_of(fn, *args, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def compare(name, log, model, repeat):
+    variants = Counter(log)
+    _, _, shared = build_trie(variants)
+    steps = sum(len(t) for t in variants)
+    edges = steps - sum(shared)
+    serial, before = best_of(fitness_token_replay, log, model, repeat=repeat)
+    trie, after = best_of(fitness_token_replay_trie, log, model, repeat=repeat)
+    assert serial == trie
+    print(f"{name:<28}{len(variants):>7}{steps:>10,}{edges:>10,}"
+          f"{before * 1e3:>11.2f} ms{after * 1e3:>9.2f} ms{before / after:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--activities", type=int, nargs="+", default=[20, 40, 80])
+    parser.add_argument("--traces", type=int, default=20_000)
+    args = parser.parse_args()
+    print(f"{'log':<28}{'variants':>7}{'firings':>10}{'trie':>10}{'serial':>14}{'trie':>12}{'speedup':>9}")
+    model = alpha(read_from_file(os.path.join(ROOT, "extension-log-4.xes")))
+    for name in ("extension-log-4.xes", "extension-log-noisy-4.xes"):
+        compare(name, read_from_file(os.path.join(ROOT, name)), model, 10 * args.repeat)
+    for n in args.activities:
+        net = block_net(n, seed=n)
+        log = list(generate_traces(net, args.traces, variants=2000, noise=0.5, seed=n))
+        compare(f"block net, {n} acts", log, net, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Peak RSS and wall time of the streaming XES reader against ET.parse.
+
+The bundled extension-log-4.xes is scaled up by repeating its traces, and
+every reader runs in a fresh interpreter so the peak RSS numbers do not mix.
+
+    python benchmarks/bench_xes_stream.py [scale]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG = os.path.join(ROOT, "extension-log-4.xes")
+
+READERS = {
+    # current reader: full ElementTree, result kept as a dict
+    "ET.parse": "from process_mining.Process_mining_Ex_2 import read_from_file\n"
+                "log = read_from_file(path)\n"
+                "n = sum(len(events) for events in log.values())",
+    # streaming reader, result kept as a dict (same output as above)
+    "stream (dict)": "from process_mining.xes_stream import read_from_file\n"
+                     "log = read_from_file(path)\n"
+                     "n = sum(len(events) for events in log.values())",
+    # streaming reader, traces consumed one at a time
+    "stream": "from process_mining.xes_stream import iter_traces\n"
+              "n = sum(len(events) for _, events in iter_traces(path))",
+}
+
+CHILD = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+path = {path!r}
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(n, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def scale_log(src, dst, scale):
+    with open(src, encoding="utf-8") as f:
+        text = f.read()
+    first = text.index("<trace>")
+    last = text.rindex("</trace>") + len("</trace>")
+    header, body, footer = text[:first], text[first:last], text[last:]
+    with open(dst, "w", encoding="utf-8") as f:
+        f.write(header)
+        for _ in range(scale):
+            f.write(body)
+            f.write("\n\t")
+        f.write(footer)
+
+
+def run(path, body):
+    code = CHILD.format(root=ROOT, path=path, body=body)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    n, elapsed, maxrss = out.stdout.split()
+    return int(n), float(elapsed), int(maxrss)
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scaled.xes")
+        scale_log(LOG, path, scale)
+        size = os.path.getsize(path) / 2**20
+        print(f"{os.path.basename(LOG)} x{scale}: {size:.1f} MiB")
+        print(f"{'reader':<16}{'events':>10}{'wall s':>10}{'peak RSS MiB':>15}")
+        for name, body in READERS.items():
+            n, elapsed, maxrss = run(path, body)
+            # ru_maxrss is in KiB on Linux
+            print(f"{name:<16}{n:>10}{elapsed:>10.2f}{maxrss / 1024:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
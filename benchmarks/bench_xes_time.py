@@ -0,0 +1,73 @@
+"""XES timestamp decoding: strptime against xes_time on a synthetic log.
+
+Timestamps are drawn from a pool of --distinct values (hourly steps, some
+with fractional seconds), the way they repeat across traces in real logs.
+
+    python benchmarks/bench_xes_time.py [--events 10000000] [--distinct 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_mining import xes_time
+from process_mining.xes_time import parse_timestamp, parse_timestamp_us
+
+
+def strptime(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z').replace(tzinfo=None)
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z').replace(tzinfo=None)
+
+
+def pool(distinct, rng):
+    start = datetime(2020, 1, 1)
+    values = []
+    for i in range(distinct):
+        dt = start + timedelta(hours=i)
+        if rng.random() < 0.2:
+            values.append(dt.strftime('%Y-%m-%dT%H:%M:%S') + f".{rng.randrange(1000):03d}+01:00")
+        else:
+            values.append(dt.strftime('%Y-%m-%dT%H:%M:%S') + "+01:00")
+    return values
+
+
+def run(fn, values, events, rng, chunk=1_000_000):
+    elapsed = 0.0
+    done = 0
+    while done < events:
+        batch = rng.choices(values, k=min(chunk, events - done))
+        start = time.perf_counter()
+        for v in batch:
+            fn(v)
+        elapsed += time.perf_counter() - start
+        done += len(batch)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--distinct", type=int, default=100_000)
+    args = parser.parse_args()
+    values = pool(args.distinct, random.Random(0))
+    assert all(strptime(v) == parse_timestamp(v) for v in values)
+
+    uncached_dt = parse_timestamp.__wrapped__
+    uncached_us = parse_timestamp_us.__wrapped__
+    print(f"{args.events:,} events, {args.distinct:,} distinct timestamps")
+    for name, fn in (("strptime", strptime), ("fast path", uncached_dt), ("fast path -> epoch us", uncached_us),
+                     ("memoized datetime", parse_timestamp), ("memoized epoch us", parse_timestamp_us)):
+        xes_time.clear_cache()
+        elapsed = run(fn, values, args.events, random.Random(1))
+        print(f"{name:<24}{elapsed:>8.2f} s {args.events / elapsed:>14,.0f} ev/s")
+
+
+if __name__ == "__main__":
+    main()
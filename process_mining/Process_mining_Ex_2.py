@@ -1,14 +1,18 @@
 import xml.etree.ElementTree as ELT
 from datetime import datetime
 from collections import defaultdict
+from . import instrument
+from .event_log import EventLog
+from .xes_time import parse_timestamp
 
 #1st function to log as dictionary from (csv like logs)
 def log_as_dictionary(log):
     log_dict_list=defaultdict(list)
     for entry in log.strip().splitlines():
-        if len(entry.split(';')) !=4:
+        fields = entry.split(';')
+        if len(fields) !=4:
             continue
-        job, event_id, username, timestamp = entry.split(';')
+        job, event_id, username, timestamp = fields
         event = {
             'job': job,
             'user': username,
@@ -56,48 +60,62 @@ def dependency_graph_inline(log):
     return log_dictionary  """
 
 def read_from_file(filename):
-    log_tree = ELT.parse(filename)
-    root = log_tree.getroot()
-    namespace = "{http://www.xes-standard.org/}"
-    log_dictionary = defaultdict(list)
-    for trace in root.findall(f'{namespace}trace'):
-        case_id = None
-        events = []
-        resource=None
-        for event in trace.findall(f'{namespace}event'):
+    with instrument.timer("xes.parse"):
+        log_tree = ELT.parse(filename)
+        root = log_tree.getroot()
+        namespace = "{http://www.xes-standard.org/}"
+        log_dictionary = defaultdict(list)
+        for trace in root.findall(f'{namespace}trace'):
+            case_id = None
+            events = []
+            resource=None
+            for event in trace.findall(f'{namespace}event'):
             
-            event_data = {}
-            for prop in event:
-                if prop.tag == f'{namespace}string' and prop.attrib['key'] == 'concept:name':
-                    event_data['concept:name'] = prop.attrib['value']
-                elif prop.tag == f'{namespace}string' and prop.attrib['key'] == 'org:resource':
-                    event_data['org:resource'] = prop.attrib['value']
-                elif prop.attrib['key'] == 'cost':
-                    event_data['cost'] = int(prop.attrib['value'])
-                elif prop.tag == f'{namespace}date' and prop.attrib['key'] == 'time:timestamp':
-                    event_data['time:timestamp'] =  datetime.strptime(prop.attrib['value'] , '%Y-%m-%dT%H:%M:%S%z').replace(tzinfo=None)   
+                event_data = {}
+                for prop in event:
+                    if prop.tag == f'{namespace}string' and prop.attrib['key'] == 'concept:name':
+                        event_data['concept:name'] = prop.attrib['value']
+                    elif prop.tag == f'{namespace}string' and prop.attrib['key'] == 'org:resource':
+                        event_data['org:resource'] = prop.attrib['value']
+                    elif prop.attrib['key'] == 'cost':
+                        event_data['cost'] = int(prop.attrib['value'])
+                    elif prop.tag == f'{namespace}date' and prop.attrib['key'] == 'time:timestamp':
+                        event_data['time:timestamp'] = parse_timestamp(prop.attrib['value'])
                 
                 
-                """ elif prop.tag == f'{namespace}date':
-                    date_as_string = prop.attrib['value']
-                    try:
-                        event_data['timestamp'] = datetime.strptime(date_as_string, '%Y-%m-%dT%H:%M:%S%z')
-                    except ValueError:
-                        event_data['timestamp'] = datetime.strptime(date_as_string, '%Y-%m-%dT%H:%M:%S.%f%z') """
+                    """ elif prop.tag == f'{namespace}date':
+                        date_as_string = prop.attrib['value']
+                        try:
+                            event_data['timestamp'] = datetime.strptime(date_as_string, '%Y-%m-%dT%H:%M:%S%z')
+                        except ValueError:
+                            event_data['timestamp'] = datetime.strptime(date_as_string, '%Y-%m-%dT%H:%M:%S.%f%z') """
             
-            if 'concept:name' in event_data:
-                events.append(event_data)
+                if 'concept:name' in event_data:
+                    events.append(event_data)
                 
-        for prop in trace.findall(f'{namespace}string'):
-            if prop.attrib['key'] == 'concept:name':
-                case_id = prop.attrib['value']
+            for prop in trace.findall(f'{namespace}string'):
+                if prop.attrib['key'] == 'concept:name':
+                    case_id = prop.attrib['value']
 
-        if case_id and events:
-            log_dictionary[case_id].extend(events)
+            if case_id and events:
+                log_dictionary[case_id].extend(events)
 
+    if instrument.enabled:
+        instrument.count("xes.parse.traces", len(log_dictionary))
+        instrument.count("xes.parse.events", sum(map(len, log_dictionary.values())))
     return log_dictionary 
-def dependency_graph_file(log):
+def dependency_graph_file(log, timing=False):
+    if timing:
+        # counts plus waiting-time mean / percentiles per edge
+        from .performance import timed_dependency_graph
+        return timed_dependency_graph(log)
     dependency_graph_id = defaultdict(lambda: defaultdict(int))
+    if isinstance(log, EventLog):
+        # one pass per variant, weighted by how often it occurs
+        for trace, count in log.iter_variants():
+            for index in range(len(trace) - 1):
+                dependency_graph_id[trace[index]][trace[index+1]] += count
+        return dependency_graph_id
     for case_id, entry in log.items():
         for index in range(len(entry) - 1):
             source = entry[index]['concept:name']
@@ -0,0 +1,214 @@
+from collections import defaultdict
+import xml.etree.ElementTree as ET
+from . import instrument
+from .event_log import EventLog
+from .alpha_places import extended_places, footprint_pairs
+from .footprint import Footprint
+from .xes_time import parse_timestamp
+
+# ---- PetriNet class (1st assignment+ additional changes ) ----
+# creating and managing a petri net->model processing 
+
+class PetriNet:
+    def __init__(self):
+        self.places = {}
+        self.transitions = {}
+        # name -> id index and frozen (inputs, outputs) tuples per transition
+        self._tid_by_name = {}
+        self._arcs = {}
+
+    def add_place(self, name, tokens=0):
+        self.places[name] = tokens
+
+    def add_transition(self, name, tid):
+        if tid not in self.transitions:
+            self.transitions[tid] = {"name": name, "inputs": [], "outputs": []}
+            self._tid_by_name.setdefault(name, tid)
+
+    def add_edge(self, source, target):
+        if source in self.places and target in self.transitions:
+            self.transitions[target]["inputs"].append(source)
+            self._arcs.pop(target, None)
+        elif source in self.transitions and target in self.places:
+            self.transitions[source]["outputs"].append(target)
+            self._arcs.pop(source, None)
+        return self
+
+    def transition_name_to_id(self, name):
+        return self._tid_by_name.get(name)
+
+    def arcs(self, transition):
+        arcs = self._arcs.get(transition)
+        if arcs is None:
+            t = self.transitions[transition]
+            arcs = self._arcs[transition] = (tuple(sorted(t["inputs"])), tuple(sorted(t["outputs"])))
+        return arcs
+
+    def is_enabled(self, transition):
+        if transition not in self.transitions:
+            return False
+        # A transition is enabled if every input place has at least one token.
+        places = self.places
+        for p in self.arcs(transition)[0]:
+            if places[p] <= 0:
+                return False
+        return True
+
+    def fire_transition(self, transition):
+        if not self.is_enabled(transition):
+            return False
+        inputs, outputs = self.arcs(transition)
+        places = self.places
+        # Consume one token from each input place.
+        for p in inputs:
+            places[p] -= 1
+        # Produce one token in each output place.
+        for p in outputs:
+            places[p] += 1
+        return True
+
+    def check_enabled(self):
+        # Note: This method is not used by the corrected test harness below.
+        result = []
+        for tid, tdata in sorted(self.transitions.items()):
+            enabled = self.is_enabled(tid)
+            result.append(enabled)
+        return result
+
+# ---- read_from_file function (changerd) ----
+def read_from_file(filename):
+    with instrument.timer("xes.parse"):
+        tree = ET.parse(filename)
+        root = tree.getroot()
+        ns = "{http://www.xes-standard.org/}"
+
+        log = defaultdict(list)
+        for trace in root.findall(f"{ns}trace"):
+            case_id = None
+            events = []
+            for event in trace.findall(f"{ns}event"):
+                event_data = {}
+                for prop in event:
+                    if prop.tag == f"{ns}string" and prop.attrib['key'] == 'concept:name':
+                        event_data['concept:name'] = prop.attrib['value']
+                    elif prop.tag == f"{ns}string" and prop.attrib['key'] == 'org:resource':
+                        event_data['org:resource'] = prop.attrib['value']
+                    elif prop.tag == f"{ns}date" and prop.attrib['key'] == 'time:timestamp':
+                        event_data['time:timestamp'] = parse_timestamp(prop.attrib['value'])
+                if 'concept:name' in event_data:
+                    events.append(event_data)
+
+            for prop in trace.findall(f"{ns}string"):
+                if prop.attrib['key'] == 'concept:name':
+                    case_id = prop.attrib['value']
+
+            if case_id and events:
+                log[case_id].extend(events)
+    if instrument.enabled:
+        instrument.count("xes.parse.traces", len(log))
+        instrument.count("xes.parse.events", sum(map(len, log.values())))
+    return log
+
+# ---- Alpha Miner function (Corrected) ----
+def alpha(log, extended=False):
+    # extended=True: also discover short loops and non-free-choice
+    # dependencies (alpha_places.extended_places)
+    pn = PetriNet()
+
+    # Step 1: Collect activities and create transitions
+    with instrument.timer("alpha.footprint"):
+        if isinstance(log, EventLog):
+            # every variant once is enough for the relations below
+            fp = Footprint.from_log(log, extended)
+        else:
+            fp = Footprint.from_traces(([e['concept:name'] for e in events] for events in log.values()), extended)
+
+    sorted_activities = sorted(fp.activities)
+    activity_to_tid = {}
+    for i, act in enumerate(sorted_activities):
+        tid = f"T{i}"
+        pn.add_transition(act, tid)
+        activity_to_tid[act] = tid
+
+    # Step 2 + 3 + 4: Relations (causality / choice bit rows of the footprint)
+    # and the maximal Y_L sets (groups of activities for creating places)
+    with instrument.timer("alpha.places"):
+        if extended:
+            maximal_y_sets, start_acts, end_acts, loops = extended_places(fp)
+        else:
+            maximal_y_sets = footprint_pairs(fp)
+            start_acts = fp.names(fp.starts)
+            end_acts = fp.names(fp.ends)
+            loops = {}
+    instrument.count("alpha.variants", fp.variants)
+    instrument.count("alpha.activities", len(fp.activities))
+    instrument.count("alpha.places", len(maximal_y_sets) + 2)
+
+    # Step 5: Build the Petri net structure
+    place_id = 0
+
+    # Start place and connections
+    start_place = f"P{place_id}"
+    place_id += 1
+    pn.add_place(start_place, 1) # Initial place has one token
+    for a in sorted(list(start_acts)):
+        pn.add_edge(start_place, activity_to_tid[a])
+
+    # End place and connections
+    end_place = f"P{place_id}"
+    place_id += 1
+    pn.add_place(end_place, 0)
+    for a in sorted(list(end_acts)):
+        pn.add_edge(activity_to_tid[a], end_place)
+
+    # Intermediate places from the maximal Y sets
+    # Sort for deterministic place naming and ordering
+    sorted_maximal_y = sorted(list(maximal_y_sets), key=lambda x: (sorted(list(x[0])), sorted(list(x[1]))))
+    
+    places = {"start": start_place, "end": end_place}
+    for A, B in sorted_maximal_y:
+        place_name = f"P{place_id}"
+        place_id += 1
+        pn.add_place(place_name, 0)
+        places[A, B] = place_name
+        for a in sorted(list(A)):
+            pn.add_edge(activity_to_tid[a], place_name)
+        for b in sorted(list(B)):
+            pn.add_edge(place_name, activity_to_tid[b])
+
+    # One-loop activities put the token back where they took it from
+    for act, keys in loops.items():
+        for key in keys:
+            pn.add_edge(places[key], activity_to_tid[act])
+            pn.add_edge(activity_to_tid[act], places[key])
+    
+    return pn
+    
+# ---- Test block (Corrected to match assignment) ----
+if __name__ == "__main__":
+    log_file = "extension-log.xes"
+    mined_model = alpha(read_from_file(log_file))
+
+    # Helper function to check enabled transitions in the required order
+    def check_enabled(pn):
+        ts = ["record issue", "inspection", "intervention authorization", "action not required", "work mandate", "no concession", "work completion", "issue completion"]
+        for t in ts:
+            print(pn.is_enabled(pn.transition_name_to_id(t)))
+        print("") # Add a blank line for separation, as in the desired output
+
+    # The specific trace to replay for the test
+    trace = [
+        "record issue",
+        "inspection",
+        "intervention authorization",
+        "work mandate",
+        "work completion",
+        "issue completion"
+    ]
+
+    # Replay the trace and check the enabled status at each step
+    for activity_name in trace:
+        check_enabled(mined_model)
+        transition_id = mined_model.transition_name_to_id(activity_name)
+        if transition_id is not None:
+            mined_model.fire_transition(transition_id)
\ No newline at end of file
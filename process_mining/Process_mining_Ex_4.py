@@ -0,0 +1,282 @@
+from array import array
+from collections import Counter
+import xml.etree.ElementTree as ET
+from . import instrument
+from .event_log import EventLog
+from .alpha_places import extended_places, footprint_pairs
+from .footprint import Footprint
+
+class PetriNet:
+    def __init__(self):
+        self.places = {}
+        self.transitions = {}
+        self.initial_marking = {}
+        self.start_place = None
+        self.end_place = None
+        # name -> id index and integer place ids, kept up to date by add_*
+        self._tid_by_name = {}
+        self._place_ids = {}
+        self._compiled = None
+
+    def add_place(self, name, tokens=0):
+        self.places[name] = tokens
+        if tokens > 0:
+            self.initial_marking[name] = tokens
+        self._place_ids.setdefault(name, len(self._place_ids))
+        self._compiled = None
+
+    def add_transition(self, name, tid):
+        if tid not in self.transitions:
+            self.transitions[tid] = {"name": name, "inputs": [], "outputs": []}
+            # lookups return the smallest id carrying the name, as the sorted scan did
+            known = self._tid_by_name.get(name)
+            if known is None or tid < known:
+                self._tid_by_name[name] = tid
+            self._compiled = None
+
+    def add_edge(self, source, target):
+        if source in self.places and target in self.transitions:
+            self.transitions[target]["inputs"].append(source)
+            self._compiled = None
+        elif source in self.transitions and target in self.places:
+            self.transitions[source]["outputs"].append(target)
+            self._compiled = None
+        return self
+
+    def transition_name_to_id(self, name):
+        return self._tid_by_name.get(name)
+
+    def place_id(self, name):
+        return self._place_ids.get(name)
+
+    def compile(self):
+        # rebuilt only after a structural change or a new initial/end marking
+        c = self._compiled
+        if c is None or c.initial_marking != self.initial_marking or c.end_place != self.end_place:
+            self._compiled = CompiledNet(self)
+        return self._compiled
+
+    def reset(self):
+        self.places = self.initial_marking.copy()
+
+def _sink_place(pn):
+    # the final place of a net that does not name one: the only place no
+    # transition consumes from
+    consumed = {p for t in pn.transitions.values() for p in t["inputs"]}
+    sinks = [p for p in pn.places if p not in consumed]
+    if len(sinks) != 1:
+        raise ValueError(f"net has no end_place and {len(sinks)} places without consumers, "
+                         f"cannot tell the final place: {sinks}")
+    return sinks[0]
+
+def to_petri_net(pn):
+    # the PetriNet classes of process_mining_ex_1 and Ex_3 keep their marking
+    # in places and do not name their start and end places; they are copied
+    # into this class (nets that compile are kept)
+    if hasattr(pn, "compile"):
+        return pn
+    copy = PetriNet()
+    for place, tokens in pn.places.items():
+        copy.add_place(place, tokens)
+    for tid, t in pn.transitions.items():
+        copy.add_transition(t["name"], tid)
+        for place in t["inputs"]:
+            copy.add_edge(place, tid)
+        for place in t["outputs"]:
+            copy.add_edge(tid, place)
+    marked = [place for place, tokens in pn.places.items() if tokens > 0]
+    copy.start_place = getattr(pn, "start_place", None) or (marked[0] if len(marked) == 1 else None)
+    copy.end_place = getattr(pn, "end_place", None) or _sink_place(pn)
+    return copy
+
+class CompiledNet:
+    """Integer-indexed snapshot of a PetriNet for replay.
+
+    Places and transitions are numbered, arcs are frozen as pre-sorted tuples
+    of place indices and markings are plain lists indexed by place. Only
+    builtins are stored, so the object pickles cheaply for worker processes.
+    """
+
+    def __init__(self, pn):
+        self.place_names = list(pn._place_ids)
+        place_ids = pn._place_ids
+        self.transition_ids = list(pn.transitions)
+        t_index = {tid: i for i, tid in enumerate(self.transition_ids)}
+        self.activity_index = {name: t_index[tid] for name, tid in pn._tid_by_name.items()}
+        self.inputs = tuple(tuple(place_ids[p] for p in sorted(t["inputs"])) for t in pn.transitions.values())
+        self.outputs = tuple(tuple(place_ids[p] for p in sorted(t["outputs"])) for t in pn.transitions.values())
+        self.n_inputs = tuple(len(i) for i in self.inputs)
+        self.n_outputs = tuple(len(o) for o in self.outputs)
+
+        self.initial_marking = dict(pn.initial_marking)
+        self.initial = [0] * len(self.place_names)
+        for p, tokens in self.initial_marking.items():
+            self.initial[place_ids[p]] = tokens
+        self.initial_tokens = sum(self.initial_marking.values())
+        self.end_place = pn.end_place
+        self.end = place_ids.get(pn.end_place, -1)
+
+    def pack(self, marking):
+        # sparse (place, tokens) pairs as bytes: compact and hashable
+        return array('i', [x for p, v in enumerate(marking) if v for x in (p, v)]).tobytes()
+
+    def unpack(self, packed):
+        marking = [0] * len(self.place_names)
+        pairs = array('i', packed)
+        for i in range(0, len(pairs), 2):
+            marking[pairs[i]] = pairs[i + 1]
+        return marking
+
+    def is_enabled(self, marking, t):
+        return all(marking[p] > 0 for p in self.inputs[t])
+
+    def fire(self, marking, t):
+        # token replay step, missing input tokens are added; returns how many
+        missing = 0
+        inputs = self.inputs[t]
+        for p in inputs:
+            if marking[p] == 0:
+                missing += 1
+                marking[p] = 1
+        for p in inputs:
+            marking[p] -= 1
+        for p in self.outputs[t]:
+            marking[p] += 1
+        return missing
+
+    def finish(self, marking):
+        # final consumption from the end place -> (missing, consumed, remaining)
+        if self.end >= 0 and marking[self.end] > 0:
+            marking[self.end] -= 1
+            m, c = 0, 1
+        else:
+            m, c = 1, 0
+        return m, c, sum(v for v in marking if v > 0)
+
+    def replay(self, trace):
+        # (missing, consumed, produced, remaining) for one trace
+        marking = list(self.initial)
+        m = c = 0
+        p = self.initial_tokens
+        for activity_name in trace:
+            t = self.activity_index.get(activity_name)
+            if t is None:
+                continue
+            m += self.fire(marking, t)
+            c += self.n_inputs[t]
+            p += self.n_outputs[t]
+        m_end, c_end, r = self.finish(marking)
+        return m + m_end, c + c_end, p, r
+
+def read_from_file(filename):
+    with instrument.timer("xes.parse"):
+        tree = ET.parse(filename)
+        root = tree.getroot()
+        ns = "{http://www.xes-standard.org/}"
+        log = []
+        for trace in root.findall(f"{ns}trace"):
+            events = [
+                prop.attrib['value']
+                for event in trace.findall(f"{ns}event")
+                for prop in event
+                if prop.tag == f"{ns}string" and prop.attrib['key'] == 'concept:name'
+            ]
+            if events:
+                log.append(tuple(events))
+    if instrument.enabled:
+        instrument.count("xes.parse.traces", len(log))
+        instrument.count("xes.parse.events", sum(map(len, log)))
+    return log
+
+def alpha(log, extended=False):
+    """Alpha miner. With extended=True short loops and non-free-choice
+    dependencies are discovered as well (alpha_places.extended_places)."""
+    # activities in order of first appearance, relations as bit matrices
+    with instrument.timer("alpha.footprint"):
+        fp = Footprint.from_log(log, extended)
+    pn = PetriNet()
+    activities = fp.activities
+
+    activity_to_tid = {act: f"T{i}" for i, act in enumerate(activities)}
+    for act, tid in activity_to_tid.items():
+        pn.add_transition(act, tid)
+
+    with instrument.timer("alpha.places"):
+        if extended:
+            maximal_y_sets, start_acts, end_acts, loops = extended_places(fp)
+        else:
+            maximal_y_sets = footprint_pairs(fp)
+            start_acts = sorted(fp.names(fp.starts))
+            end_acts = sorted(fp.names(fp.ends))
+            loops = {}
+    instrument.count("alpha.variants", fp.variants)
+    instrument.count("alpha.activities", len(activities))
+    instrument.count("alpha.places", len(maximal_y_sets) + 2)
+
+    place_id = 0
+    start_place_name = f"P{place_id}"; place_id += 1
+    pn.add_place(start_place_name, 1)
+    pn.start_place = start_place_name
+    for a in start_acts:
+        pn.add_edge(start_place_name, activity_to_tid[a])
+
+    places = {"start": start_place_name}
+    sorted_y = sorted(list(maximal_y_sets), key=lambda x: (sorted(list(x[0])), sorted(list(x[1]))))
+    for A, B in sorted_y:
+        p_name = f"P{place_id}"; place_id += 1
+        pn.add_place(p_name)
+        places[A, B] = p_name
+        for a_in in sorted(list(A)):
+            pn.add_edge(activity_to_tid[a_in], p_name)
+        for b_out in sorted(list(B)):
+            pn.add_edge(p_name, activity_to_tid[b_out])
+
+    end_place_name = f"P{place_id}"; place_id += 1
+    pn.add_place(end_place_name)
+    pn.end_place = end_place_name
+    places["end"] = end_place_name
+    for a in end_acts:
+        pn.add_edge(activity_to_tid[a], end_place_name)
+
+    # one-loop activities put the token back where they took it from
+    for act, keys in loops.items():
+        for key in keys:
+            pn.add_edge(places[key], activity_to_tid[act])
+            pn.add_edge(activity_to_tid[act], places[key])
+
+    pn.initial_marking = {k: v for k, v in pn.places.items() if v > 0}
+    return pn
+
+def fitness_from_counts(m, c, p, r):
+    fit_cons = 1 - (m / c)
+    fit_prod = 1 - (r / p)
+    fitness = 0.5 * fit_cons + 0.5 * fit_prod
+    return round(fitness, 5)
+
+def fitness_token_replay(log, pn):
+    trace_counts = log.variant_counter() if isinstance(log, EventLog) else Counter(log)
+    net = pn.compile()
+    total_m = total_c = total_p = total_r = 0.0
+
+    with instrument.timer("replay"):
+        for trace, count in trace_counts.items():
+            m, c, p, r = net.replay(trace)
+            total_m += m * count
+            total_c += c * count
+            total_p += p * count
+            total_r += r * count
+    if instrument.enabled:
+        instrument.count("replay.variants", len(trace_counts))
+        instrument.count("replay.traces", sum(trace_counts.values()))
+        instrument.count("replay.events", sum(len(t) * n for t, n in trace_counts.items()))
+
+    return fitness_from_counts(total_m, total_c, total_p, total_r)
+
+if __name__ == "__main__":
+    log = read_from_file("extension-log-4.xes")
+    log_noisy = read_from_file("extension-log-noisy-4.xes")
+
+    mined_model = alpha(log)
+
+    print(round(fitness_token_replay(log, mined_model), 5))
+    print(round(fitness_token_replay(log_noisy, mined_model), 5))
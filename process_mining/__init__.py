@@ -0,0 +1,5 @@
+"""Alpha miner, token replay and alignments on XES event logs.
+
+The modules are imported one by one (e.g. process_mining.event_log); the
+package itself loads nothing, so the pm command line starts fast.
+"""
@@ -0,0 +1,307 @@
+import heapq
+import os
+import time
+from collections import Counter, deque
+from multiprocessing import Pool
+
+from .event_log import EventLog
+from .Process_mining_Ex_4 import to_petri_net
+
+# ---- optimal alignments (A* over the synchronous product) ----
+# A state is (marking, position in the trace). Moves are synchronous (the next
+# event and an enabled transition with the same label, cost 0), log moves (skip
+# the event, cost 1) and model moves (fire an enabled transition, cost 1). The
+# goal is the final marking (one token in the end place) with the whole trace
+# consumed.
+# Heuristic: the remaining events whose activity the net does not know are
+# log moves for sure (u). A token outside the end place has to be moved on
+# until it reaches the end place or is consumed by a transition without
+# output places (alpha mines those from noisy logs); dist(p) is the fewest
+# firings that takes, and at most r of them can be synchronous, r being the
+# remaining events the net does know, so h = u + max(0, D - r) with D the
+# largest dist of a marked place. Also, on the way every transition whose
+# label is not among the remaining events is a model move, so the largest
+# such count W (a shortest path where only those transitions weigh 1) is a
+# bound too: h = u + max(D - r, W, 0). h never overestimates and drops by at
+# most the cost of a move, so the first goal popped is optimal.
+# Markings that can no longer reach the final marking (a token in a place
+# that can never be emptied, or a second token in an end place nothing
+# consumes) are pruned. Each variant is aligned once.
+
+INF = float("inf")
+SKIP = ">>"
+
+
+def reverse_arcs(net):
+    # q -> [(p, t), ...]: firing t moves a token from p to q; the extra last
+    # entry stands for "consumed", reached by transitions without outputs
+    sink = len(net.place_names)
+    into = [[] for _ in range(sink + 1)]
+    for t, (inputs, outputs) in enumerate(zip(net.inputs, net.outputs)):
+        for q in set(outputs) if outputs else (sink,):
+            into[q].extend((p, t) for p in set(inputs))
+    return into
+
+
+def place_distances(net, weights=None, into=None):
+    """Fewest firings that take a token from each place into the end place or
+    consume it with a transition without outputs; with 0/1 weights (one per
+    transition) the lightest such path instead. INF marks places whose
+    tokens can never be cleared."""
+    sink = len(net.place_names)
+    dist = [INF] * (sink + 1)
+    if net.end < 0:
+        return dist[:sink]
+    if into is None:
+        into = reverse_arcs(net)
+    # 0-1 breadth-first search backwards from the end place and the sink
+    dist[net.end] = dist[sink] = 0
+    queue = deque([net.end, sink])
+    while queue:
+        q = queue.popleft()
+        for p, t in into[q]:
+            weight = 1 if weights is None else weights[t]
+            if dist[q] + weight < dist[p]:
+                dist[p] = dist[q] + weight
+                if weight:
+                    queue.append(p)
+                else:
+                    queue.appendleft(p)
+    return dist[:sink]
+
+
+class Alignment:
+    def __init__(self, trace, cost, moves, states, empty_cost):
+        self.trace = trace
+        self.cost = cost
+        self.moves = moves          # (log label or ">>", model label or ">>")
+        self.states = states        # states taken from the queue
+        self.empty_cost = empty_cost
+
+    @property
+    def fitness(self):
+        # None when the cheapest model run is unknown (over budget)
+        if self.empty_cost == INF:
+            return None
+        worst = len(self.trace) + self.empty_cost
+        return 1 - self.cost / worst if worst else 1.0
+
+    def __repr__(self):
+        return f"Alignment(cost={self.cost}, moves={len(self.moves)}, states={self.states})"
+
+
+class Aligner:
+    """Aligns traces against a PetriNet (Ex_3 nets are converted). align()
+    returns None when a trace needs more than max_states states or timeout
+    seconds."""
+
+    def __init__(self, pn, max_states=200_000, timeout=None, cache_size=100_000):
+        net = to_petri_net(pn).compile()
+        if net.end < 0:
+            raise ValueError("the net needs an end place")
+        self.net = net
+        self.max_states = max_states
+        self.timeout = timeout
+        self.labels = [pn.transitions[tid]["name"] for tid in net.transition_ids]
+        self.known = set(self.labels)
+        self.dist = place_distances(net)
+        n_places = len(net.place_names)
+        final = [0] * n_places
+        final[net.end] = 1
+        self.final = tuple(final)
+        self.end_consumed = any(net.end in inputs for inputs in net.inputs)
+        self.consumers = [[] for _ in range(n_places)]
+        for t, inputs in enumerate(net.inputs):
+            for p in set(inputs):
+                self.consumers[p].append(t)
+        self.sourceless = [t for t, inputs in enumerate(net.inputs) if not inputs]
+        self.cache_size = cache_size
+        self._expanded = {}
+        self._into = reverse_arcs(net)
+        self._distances = {}  # labels -> (labels, place distances)
+        self._unmatched = {}  # (marking, labels) -> largest distance
+        empty = self._search(())
+        self.empty_cost = empty[0] if empty is not None else INF
+
+    def _fire(self, marking, t):
+        new = list(marking)
+        for p in self.net.inputs[t]:
+            new[p] -= 1
+        for p in self.net.outputs[t]:
+            new[p] += 1
+        if not self.end_consumed and new[self.net.end] > 1:
+            return None
+        dist = self.dist
+        for p in self.net.outputs[t]:
+            if dist[p] == INF:
+                return None
+        return tuple(new)
+
+    def _expand(self, marking):
+        # (D, [(label, next marking), ...]) of a marking; markings recur across
+        # positions and variants, so this is cached (cleared when it gets big)
+        found = self._expanded.get(marking)
+        if found is not None:
+            return found
+        net = self.net
+        candidates = {t for p, v in enumerate(marking) if v for t in self.consumers[p]}
+        enabled = [t for t in candidates if all(marking[p] >= net.inputs[t].count(p) for p in net.inputs[t])]
+        enabled.extend(self.sourceless)
+        moves = []
+        for t in sorted(enabled):
+            new = self._fire(marking, t)
+            if new is not None:
+                moves.append((self.labels[t], new))
+        far = max((self.dist[p] for p, v in enumerate(marking) if v), default=0)
+        if len(self._expanded) >= self.cache_size:
+            self._expanded.clear()
+        found = self._expanded[marking] = (far, moves)
+        return found
+
+    def _label_distances(self, labels):
+        # place_distances with only transitions outside labels weighing 1,
+        # together with labels as a cache key for the heuristic
+        dist = self._distances.get(labels)
+        if dist is None:
+            weights = [0 if label in labels else 1 for label in self.labels]
+            dist = self._distances[labels] = (labels, place_distances(self.net, weights, self._into))
+        return dist
+
+    def _heuristic(self, marking, unknown, known, label_dist):
+        far = self._expand(marking)[0]
+        key = (marking, label_dist[0])
+        unmatched = self._unmatched.get(key)
+        if unmatched is None:
+            if len(self._unmatched) >= self.cache_size:
+                self._unmatched.clear()
+            dist = label_dist[1]
+            unmatched = self._unmatched[key] = max((dist[p] for p, v in enumerate(marking) if v), default=0)
+        return unknown + max(far - known, unmatched, 0)
+
+    def align(self, trace):
+        trace = tuple(trace)
+        found = self._search(trace)
+        if found is None:
+            return None
+        cost, moves, states = found
+        return Alignment(trace, cost, moves, states, self.empty_cost)
+
+    def _search(self, trace):
+        # (cost, moves, states popped) of an optimal alignment, or None
+        n = len(trace)
+        # events from position i on that the net knows / does not know
+        known = [0] * (n + 1)
+        unknown = [0] * (n + 1)
+        label_dist = [None] * (n + 1)
+        labels = frozenset()
+        label_dist[n] = self._label_distances(labels)
+        for i in range(n - 1, -1, -1):
+            hit = trace[i] in self.known
+            known[i] = known[i + 1] + hit
+            unknown[i] = unknown[i + 1] + (not hit)
+            if hit and trace[i] not in labels:
+                labels = labels | {trace[i]}
+                label_dist[i] = self._label_distances(labels)
+            else:
+                label_dist[i] = label_dist[i + 1]
+        deadline = None if self.timeout is None else time.perf_counter() + self.timeout
+
+        start = (tuple(self.net.initial), 0)
+        if any(v and self.dist[p] == INF for p, v in enumerate(start[0])):
+            return None
+        best = {start: 0}
+        parent = {start: None}
+        tie = 0
+        queue = [(self._heuristic(start[0], unknown[0], known[0], label_dist[0]), 0, tie, start)]
+        popped = 0
+        while queue:
+            f, neg_g, _, state = heapq.heappop(queue)
+            g = -neg_g
+            if g > best.get(state, INF):
+                continue
+            marking, i = state
+            if i == n and marking == self.final:
+                return g, self._moves(parent, state), popped
+            popped += 1
+            if popped > self.max_states or (deadline is not None and popped % 256 == 0
+                                             and time.perf_counter() > deadline):
+                return None
+            successors = []
+            if i < n:
+                successors.append(((marking, i + 1), 1, (trace[i], SKIP)))
+            for label, new in self._expand(marking)[1]:
+                if i < n and label == trace[i]:
+                    successors.append(((new, i + 1), 0, (label, label)))
+                successors.append(((new, i), 1, (SKIP, label)))
+            for nxt, cost, move in successors:
+                g2 = g + cost
+                if g2 < best.get(nxt, INF):
+                    best[nxt] = g2
+                    parent[nxt] = (state, move)
+                    tie += 1
+                    j = nxt[1]
+                    h = self._heuristic(nxt[0], unknown[j], known[j], label_dist[j])
+                    # on equal f prefer the state further along (larger g)
+                    heapq.heappush(queue, (g2 + h, -g2, tie, nxt))
+        return None
+
+    def _moves(self, parent, state):
+        moves = []
+        while parent[state] is not None:
+            state, move = parent[state]
+            moves.append(move)
+        moves.reverse()
+        return moves
+
+
+# ---- whole logs: one alignment per variant, optionally in a process pool ----
+
+_aligner = None
+
+
+def _init_worker(pn, max_states, timeout):
+    global _aligner
+    _aligner = Aligner(pn, max_states, timeout)
+
+
+def _align_shard(traces):
+    return [(trace, _aligner.align(trace)) for trace in traces]
+
+
+def align_log(log, pn, workers=1, max_states=200_000, timeout=None, chunk_size=50):
+    """{variant: Alignment or None} for an EventLog, a list of activity tuples
+    or a Counter of them. None marks variants that ran out of budget."""
+    trace_counts = log.variant_counter() if isinstance(log, EventLog) else Counter(log)
+    variants = list(trace_counts)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(variants) <= chunk_size:
+        aligner = Aligner(pn, max_states, timeout)
+        return {trace: aligner.align(trace) for trace in variants}
+    shards = [variants[i:i + chunk_size] for i in range(0, len(variants), chunk_size)]
+    results = {}
+    with Pool(min(workers, len(shards)), initializer=_init_worker,
+              initargs=(pn, max_states, timeout)) as pool:
+        for shard in pool.imap_unordered(_align_shard, shards):
+            results.update(shard)
+    return {trace: results[trace] for trace in variants}
+
+
+def fitness_alignments(log, pn, workers=1, max_states=200_000, timeout=None):
+    """Alignment-based fitness of the log: 1 - total cost / total worst-case
+    cost (every event a log move plus the cheapest model run), weighted by
+    variant frequency. Variants over budget are left out (all of them when
+    the cheapest model run itself was); the second value is how many traces
+    that concerned."""
+    trace_counts = log.variant_counter() if isinstance(log, EventLog) else Counter(log)
+    alignments = align_log(trace_counts, pn, workers, max_states, timeout)
+    cost = worst = skipped = 0
+    for trace, count in trace_counts.items():
+        alignment = alignments[trace]
+        if alignment is None or alignment.empty_cost == INF:
+            skipped += count
+            continue
+        cost += alignment.cost * count
+        worst += (len(trace) + alignment.empty_cost) * count
+    fitness = round(1 - cost / worst, 5) if worst else None
+    return fitness, skipped
@@ -0,0 +1,282 @@
+from .footprint import iter_bits
+
+# ---- Alpha miner place discovery (step 3 + 4) ----
+# Instead of pairing every subset of the activities with every other subset,
+# A is grown clique by clique along the choice relation, only as long as the
+# activities in A still share a causal successor, and B is taken from the
+# maximal choice-cliques among those shared successors. Maximality of A is
+# checked locally by trying to add one more activity, which is equivalent to
+# the old pairwise superset test because valid (A, B) pairs are closed under
+# taking non-empty subsets. Sets of activities are bit masks over the
+# footprint's activity numbering, so every subset test is a bitwise AND.
+
+
+def maximal_cliques(nodes, unrelated):
+    # Bron-Kerbosch with pivoting on the choice relation restricted to nodes
+    cliques = []
+
+    def expand(r, p, x):
+        if not p and not x:
+            cliques.append(r)
+            return
+        pivot = max(iter_bits(p | x), key=lambda u: bin(p & unrelated[u]).count("1"))
+        for v in iter_bits(p & ~unrelated[pivot]):
+            bit = 1 << v
+            expand(r | bit, p & unrelated[v], x & unrelated[v])
+            p &= ~bit
+            x |= bit
+
+    expand(0, nodes, 0)
+    return cliques
+
+
+def maximal_bit_pairs(causal, unrelated):
+    """Maximal (A, B) masks for bit rows causal[a] (a -> b) and unrelated[a]
+    (a # b, without a itself)."""
+    pairs = []
+    causes = [0] * len(causal)  # column view: causes[b] has bit a if a -> b
+    for a, row in enumerate(causal):
+        for b in iter_bits(row):
+            causes[b] |= 1 << a
+
+    def grow(a_mask, candidates, common_succ, extendable):
+        # extendable: activities unrelated to all of A, outside A
+        for b_mask in maximal_cliques(common_succ, unrelated):
+            # A is maximal if no extendable activity causes all of B
+            cover = extendable
+            for b in iter_bits(b_mask):
+                cover &= causes[b]
+            if not cover:
+                pairs.append((a_mask, b_mask))
+        for x in iter_bits(candidates):
+            shared = common_succ & causal[x]
+            if shared:
+                later = candidates & ~((2 << x) - 1)
+                grow(a_mask | 1 << x, later & unrelated[x], shared, extendable & unrelated[x] & ~(1 << x))
+
+    has_succ = 0
+    for a, row in enumerate(causal):
+        if row:
+            has_succ |= 1 << a
+    for a in iter_bits(has_succ):
+        later = has_succ & ~((2 << a) - 1)
+        grow(1 << a, later & unrelated[a], causal[a], unrelated[a])
+    return pairs
+
+
+def footprint_pairs(fp):
+    # maximal pairs of a footprint.Footprint as frozensets of activity names
+    return {(frozenset(fp.names(a)), frozenset(fp.names(b)))
+            for a, b in maximal_bit_pairs(fp.causal, fp.choice)}
+
+
+def maximal_pairs(activities, causality, choice):
+    """Return the maximal (A, B) pairs of the Alpha miner as frozenset tuples.
+
+    A and B are sets of activities that are pairwise in the choice relation,
+    and every a in A causes every b in B.
+    """
+    activities = list(activities)
+    index = {a: i for i, a in enumerate(activities)}
+    causal = [0] * len(activities)
+    unrelated = [0] * len(activities)
+    for a, b in causality:
+        causal[index[a]] |= 1 << index[b]
+    for a, b in choice:
+        if a != b:
+            unrelated[index[a]] |= 1 << index[b]
+            unrelated[index[b]] |= 1 << index[a]
+    names = lambda mask: frozenset(activities[i] for i in iter_bits(mask))
+    return {(names(a), names(b)) for a, b in maximal_bit_pairs(causal, unrelated)}
+
+
+# ---- extended mode: short loops and non-free-choice dependencies ----
+# Alpha+ style: activities directly following themselves (one-loops) are
+# taken out (an activity repeating in fewer than LOOP_SHARE of the traces it
+# occurs in is taken as a logged twice by mistake, not as a loop), the relations of the remaining activities are recomputed as if
+# they were never logged (walking over the collapsed (x, t, y) triples), and
+# a b a / b a b patterns (two-loops) count as causal in both directions
+# instead of parallel. Every one-loop activity then becomes a self loop on
+# the place between its predecessors and successors, or on the start / end
+# place when it opens / closes traces. The activities right after such a
+# start loop become start activities, so a place (A, B) among the start
+# activities that also feeds them would keep them from firing after the
+# loop: it is folded into the start place, A's activities loop on the start
+# place instead (they take its token and put it back for B). The same,
+# mirrored, for the end place.
+# Alpha++ style: for a free choice place (A, B), an activity a decides the
+# choice for b if after a only b of B ever follows, always. The latest such
+# activities that are pairwise unrelated and together always precede b get
+# an extra place (K, {b}). Activities repeating within a trace are skipped,
+# the extra place would not stay balanced for them.
+
+LOOP_SHARE = 0.1
+
+
+def _filtered_succ(fp, loops):
+    # directly follows rows (and start/end masks) with the one-loop
+    # activities removed from every trace
+    n = len(fp.activities)
+    succ = [fp.succ[a] & ~loops if not loops >> a & 1 else 0 for a in range(n)]
+    starts = fp.starts & ~loops
+    ends = fp.ends & ~loops
+    nexts = {}
+    for x, t, y in fp.bridges:
+        if t >= 0 and loops >> t & 1:
+            nexts.setdefault((x, t), []).append(y)
+    for key in nexts:
+        x = key[0]
+        if x >= 0 and loops >> x & 1:
+            continue
+        stack = [key]
+        seen = {key}
+        while stack:
+            p, c = stack.pop()
+            for y in nexts.get((p, c), ()):
+                if y >= 0 and loops >> y & 1:
+                    if (c, y) not in seen:
+                        seen.add((c, y))
+                        stack.append((c, y))
+                elif x < 0 and y >= 0:
+                    starts |= 1 << y
+                elif x >= 0 and y < 0:
+                    ends |= 1 << x
+                elif x >= 0:
+                    succ[x] |= 1 << y
+    return succ, starts, ends
+
+
+def _loop_places(fp, loops, pairs):
+    # place of every one-loop activity t: a place (A, B) with all of t's
+    # (filtered) predecessors in A and successors in B, else one touching
+    # both; the start / end place when t opens / closes traces
+    start_pred = {t for x, t, _ in fp.bridges if x < 0 and t >= 0}
+    end_succ = {t for _, t, y in fp.bridges if y < 0 and t >= 0}
+    placed = {}
+    for t in iter_bits(loops):
+        pred = succ = 0
+        for x, c, y in fp.bridges:
+            if c == t:
+                if x >= 0 and not loops >> x & 1:
+                    pred |= 1 << x
+                if y >= 0 and not loops >> y & 1:
+                    succ |= 1 << y
+        keys = [(a, b) for a, b in pairs if pred and succ and pred & a == pred and succ & b == succ]
+        if not keys:
+            keys = [(a, b) for a, b in pairs if pred & a and succ & b]
+        if t in start_pred and not pred:
+            keys.append("start")
+        if t in end_succ and not succ:
+            keys.append("end")
+        placed[t] = keys
+    return placed
+
+
+def _fold_boundary_places(fp, placed, pairs, starts, ends):
+    # pairs (A, B) within the start (end) activities that feed an activity
+    # right after a start loop (before an end loop) become loops of A (B) on
+    # the start (end) place; returns the remaining pairs, starts and ends
+    opened = closed = 0
+    for x, t, y in fp.bridges:
+        keys = placed.get(t, ())
+        if x < 0 and y >= 0 and "start" in keys and y not in placed:
+            opened |= 1 << y
+        if y < 0 and x >= 0 and "end" in keys and x not in placed:
+            closed |= 1 << x
+    kept = []
+    for a, b in pairs:
+        if b & opened and (a | b) & ~starts == 0:
+            side, looping = "start", a
+            starts &= ~a
+        elif a & closed and (a | b) & ~ends == 0:
+            side, looping = "end", b
+            ends &= ~b
+        else:
+            kept.append((a, b))
+            continue
+        for x in iter_bits(looping):
+            placed.setdefault(x, []).append(side)
+    return kept, starts, ends
+
+
+def _decided_choices(fp, loops, causal, unrelated, pairs):
+    # Alpha++ style places (K, {b}) for free choice places (A, B)
+    n = len(fp.activities)
+    skip = loops | fp.repeats
+    always_after = []
+    for a in range(n):
+        mask = -1
+        for later in fp.after[a]:
+            mask &= later
+        always_after.append(mask if fp.after[a] else 0)
+    extra = set()
+    for a_mask, b_mask in pairs:
+        if b_mask & (b_mask - 1) == 0:
+            continue
+        for b in iter_bits(b_mask & ~skip):
+            bit = 1 << b
+            deciders = 0
+            for a in range(n):
+                if skip >> a & 1 or a == b or causal[a] >> b & 1 or not fp.after[a]:
+                    continue
+                if all(later & b_mask == bit for later in fp.after[a]):
+                    deciders |= 1 << a
+            # keep the latest deciders only
+            latest = deciders
+            for a in iter_bits(deciders):
+                if always_after[a] & deciders:
+                    latest &= ~(1 << a)
+            for k in maximal_cliques(latest, unrelated):
+                if all(first & k for first in fp.before[b]):
+                    extra.add((k, bit))
+    return extra
+
+
+def extended_places(fp):
+    """Places of the extended miner for a Footprint built with extended=True.
+
+    Returns (pairs, starts, ends, loops): the (A, B) name sets of the places,
+    the activities after the start place and before the end place, and for
+    every one-loop activity (and every activity folded into the start / end
+    place) the places it loops on, given as (A, B) pairs or the strings
+    'start' / 'end'.
+    """
+    n = len(fp.activities)
+    full = (1 << n) - 1
+    loops = 0
+    for a in range(n):
+        if fp.succ[a] >> a & 1 and fp.doubled[a] >= LOOP_SHARE * fp.occurs[a]:
+            loops |= 1 << a
+    succ, starts, ends = _filtered_succ(fp, loops)
+    pred = [0] * n
+    for a in range(n):
+        for b in iter_bits(succ[a]):
+            pred[b] |= 1 << a
+    # two-loops: a b a and b a b both seen
+    triangle = [0] * n
+    for x, t, y in fp.bridges:
+        if x == y >= 0 and t >= 0 and not (loops >> x & 1 or loops >> t & 1):
+            triangle[x] |= 1 << t
+    causal = [0] * n
+    unrelated = [0] * n
+    for a in range(n):
+        if loops >> a & 1:
+            continue
+        short = 0
+        for b in iter_bits(triangle[a]):
+            if triangle[b] >> a & 1:
+                short |= 1 << b
+        causal[a] = succ[a] & (~pred[a] | short)
+        unrelated[a] = full & ~loops & ~(succ[a] | pred[a]) & ~(1 << a)
+    pairs = maximal_bit_pairs(causal, unrelated)
+    pairs.extend(_decided_choices(fp, loops, causal, unrelated, pairs))
+    placed = _loop_places(fp, loops, pairs)
+    pairs, starts, ends = _fold_boundary_places(fp, placed, pairs, starts, ends)
+
+    def named(key):
+        if isinstance(key, str):
+            return key
+        return frozenset(fp.names(key[0])), frozenset(fp.names(key[1]))
+
+    return ({named(p) for p in pairs}, sorted(fp.names(starts)), sorted(fp.names(ends)),
+            {fp.activities[t]: [named(k) for k in keys] for t, keys in placed.items()})
@@ -0,0 +1,174 @@
+import asyncio
+from datetime import datetime
+
+from .event_log import to_micros
+
+# ---- asyncio ingestion of job;case;user;timestamp feeds ----
+# A reader task cuts the incoming bytes into batches of complete lines and
+# puts them on a bounded queue; a parser task splits each row once, parses
+# the timestamp and hands the event to a sink. When the sink falls behind the
+# queue fills up, the reader stops reading and the pipe/socket applies
+# backpressure to the sender. Malformed rows are counted, not dropped silently.
+
+CHUNK_SIZE = 1 << 16
+
+
+class IngestStats:
+    def __init__(self):
+        self.bytes = 0
+        self.rows = 0
+        self.batches = 0
+        self.malformed = {"fields": 0, "timestamp": 0, "encoding": 0}
+
+    @property
+    def malformed_rows(self):
+        return sum(self.malformed.values())
+
+    def as_dict(self):
+        return {"bytes": self.bytes, "rows": self.rows, "batches": self.batches,
+                "malformed": dict(self.malformed)}
+
+
+def parse_rows(lines, stats):
+    # lines of 'job;case;user;timestamp' -> (case, job, user, datetime)
+    rows = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        fields = line.split(';')
+        if len(fields) != 4:
+            stats.malformed["fields"] += 1
+            continue
+        job, case_id, user, timestamp = fields
+        try:
+            # fixed '%Y-%m-%d %H:%M:%S' layout, fromisoformat is much faster than strptime
+            if len(timestamp) != 19 or timestamp[10] != ' ':
+                raise ValueError(timestamp)
+            ts = datetime.fromisoformat(timestamp)
+        except ValueError:
+            stats.malformed["timestamp"] += 1
+            continue
+        rows.append((case_id, job, user, ts))
+    stats.rows += len(rows)
+    return rows
+
+
+def dfg_sink(dfg):
+    # feed an incremental_dfg.IncrementalDFG
+    def sink(case_id, job, user, timestamp):
+        dfg.add_event(case_id, job)
+    return sink
+
+
+def conformance_sink(conformance):
+    # feed a streaming_conformance.StreamingConformance, idle time in seconds
+    def sink(case_id, job, user, timestamp):
+        conformance.add_event(case_id, job, to_micros(timestamp) / 1_000_000)
+    return sink
+
+
+async def file_chunks(path, chunk_size=CHUNK_SIZE):
+    loop = asyncio.get_running_loop()
+    with open(path, "rb") as f:
+        while True:
+            # default thread pool, as asyncio.to_thread (3.9+) would do
+            chunk = await loop.run_in_executor(None, f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def stream_chunks(reader, chunk_size=CHUNK_SIZE):
+    # asyncio.StreamReader of a pipe or socket
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def pipe_chunks(pipe, chunk_size=CHUNK_SIZE):
+    # a readable pipe file object, e.g. sys.stdin.buffer
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=chunk_size)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    async for chunk in stream_chunks(reader, chunk_size):
+        yield chunk
+
+
+async def _read_batches(chunks, queue, batch_size, stats):
+    tail = b""
+    batch = []
+    try:
+        async for chunk in chunks:
+            stats.bytes += len(chunk)
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            batch.extend(lines)
+            while len(batch) >= batch_size:
+                await queue.put(batch[:batch_size])
+                del batch[:batch_size]
+        if tail:
+            batch.append(tail)
+        if batch:
+            await queue.put(batch)
+    except Exception:
+        # wake the parser up before failing
+        await queue.put(None)
+        raise
+    await queue.put(None)
+
+
+async def _parse_batches(queue, sink, stats):
+    while True:
+        batch = await queue.get()
+        if batch is None:
+            return
+        stats.batches += 1
+        lines = []
+        for raw in batch:
+            try:
+                lines.append(raw.decode("utf-8"))
+            except UnicodeDecodeError:
+                stats.malformed["encoding"] += 1
+        for row in parse_rows(lines, stats):
+            sink(*row)
+        # let the reader refill the queue between batches
+        await asyncio.sleep(0)
+
+
+async def ingest(chunks, sink, batch_size=2048, queue_size=8, stats=None):
+    """Feed every row of an async byte-chunk iterator to sink(case, job, user, ts).
+
+    At most queue_size batches of batch_size lines are buffered at a time.
+    """
+    stats = stats or IngestStats()
+    queue = asyncio.Queue(maxsize=queue_size)
+    reader = asyncio.ensure_future(_read_batches(chunks, queue, batch_size, stats))
+    try:
+        await _parse_batches(queue, sink, stats)
+    finally:
+        if not reader.done():
+            reader.cancel()
+    await reader
+    return stats
+
+
+async def ingest_file(path, sink, **kwargs):
+    return await ingest(file_chunks(path), sink, **kwargs)
+
+
+async def serve_socket(path, sink, **kwargs):
+    """Ingest every connection to a local (unix) socket at path. Returns the
+    server and the stats shared by all connections."""
+    stats = IngestStats()
+
+    async def handle(reader, writer):
+        try:
+            await ingest(stream_chunks(reader), sink, stats=stats, **kwargs)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(handle, path)
+    return server, stats
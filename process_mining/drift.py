@@ -0,0 +1,295 @@
+import math
+from collections import Counter, deque
+
+from .event_log import MISSING, EventLog
+from .xes_stream import iter_traces
+from .xes_time import parse_timestamp_us
+
+# ---- concept drift on the directly-follows relation ----
+# Two adjacent windows slide over the traces: a reference window and, right
+# after it, a recent window, each `window` traces long (or, with
+# window_seconds, each covering that much time). Both keep summed
+# directly-follows counts and, per edge, the number of traces that contain it.
+# A new trace adds its own edge Counter to the recent window, the oldest
+# recent trace moves on to the reference window and the oldest reference
+# trace is dropped, so keeping the windows costs O(trace length) per trace,
+# whatever the window size.
+# Test: the edges of one trace are not independent of each other, traces are,
+# so every edge gets a G-test on its 2 x 2 table (traces with / without the
+# edge in either window) and the smallest p-value times the number of edges
+# (Bonferroni) is the p-value of the windows. With windows of equal trace
+# counts the statistic of an edge only changes when a trace with that edge
+# moves, so only those edges are recomputed; timed windows recompute all
+# edges, O(distinct edges) per trace.
+# A p-value below `significance` is a drift point. Its position is estimated
+# inside the recent window from the cumulative sum of the most changed edge.
+# Later points are only reported once the reference window holds no trace
+# from before the last detection.
+
+
+def chi2_sf(x, df):
+    """P(X > x) for X chi-square distributed with df degrees of freedom, i.e.
+    the regularized upper incomplete gamma function Q(df / 2, x / 2)."""
+    if x <= 0:
+        return 1.0
+    if df == 1:
+        return math.erfc(math.sqrt(x / 2))
+    if df == 2:
+        return math.exp(-x / 2)
+    a, x = df / 2, x / 2
+    log_front = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # series for the lower function P
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(log_front))
+    # continued fraction for Q (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, h * math.exp(log_front))
+
+
+def g_statistic(k1, n1, k2, n2):
+    # G-test of k1 out of n1 against k2 out of n2 (2 x 2 table, one df)
+    total = n1 + n2
+    hits = k1 + k2
+    g = 0.0
+    for observed, row, column in ((k1, n1, hits), (n1 - k1, n1, total - hits),
+                                  (k2, n2, hits), (n2 - k2, n2, total - hits)):
+        if observed:
+            g += observed * math.log(observed * total / (row * column))
+    return max(2 * g, 0.0)
+
+
+def trace_edges(trace):
+    # directly-follows counts of one trace
+    return Counter(zip(trace, trace[1:]))
+
+
+class DriftPoint:
+    def __init__(self, trace, detected_at, timestamp, p_value, edges):
+        self.trace = trace              # estimated first trace after the change
+        self.detected_at = detected_at  # trace that triggered the detection
+        self.timestamp = timestamp      # its timestamp (None for untimed traces)
+        self.p_value = p_value
+        self.edges = edges  # (source, target, reference share, recent share), most changed first
+
+    def __repr__(self):
+        return f"DriftPoint(trace={self.trace}, detected_at={self.detected_at}, p={self.p_value:.3g})"
+
+
+class DriftDetector:
+    """Sliding-window drift detection over complete traces.
+
+    By default both windows hold `window` traces. With window_seconds they
+    cover that many seconds each, by the timestamp given with every trace
+    (traces must then arrive in timestamp order), and are tested once both
+    hold at least min_traces traces. Trace indices count the traces in the
+    order they were added.
+    """
+
+    def __init__(self, window=200, window_seconds=None, significance=0.001, min_traces=30, top_edges=5):
+        self.window = window
+        self.window_seconds = window_seconds
+        self.significance = significance
+        self.min_traces = min_traces if window_seconds is not None else window
+        self.top_edges = top_edges
+        self.reference = deque()  # (trace index, timestamp, edge Counter)
+        self.recent = deque()
+        self.reference_counts = Counter()  # edge -> directly-follows count
+        self.recent_counts = Counter()
+        self.reference_traces = Counter()  # edge -> traces containing it
+        self.recent_traces = Counter()
+        self.statistics = {}  # edge -> G (kept up to date in count mode)
+        self.traces = 0
+        self.last_p = None
+        self.drifts = []
+        self._quiet_until = 0  # no drift while the reference has older traces
+        self._full = False
+        self._g_cache = {}
+
+    def add_trace(self, trace, timestamp=None):
+        """Add one finished trace (activity names); returns a DriftPoint when
+        the windows now differ significantly, else None."""
+        if self.window_seconds is not None and timestamp is None:
+            raise ValueError("timed windows need a timestamp for every trace")
+        edges = trace_edges(tuple(trace))
+        self.recent.append((self.traces, timestamp, edges))
+        _add(self.recent_counts, edges, 1)
+        _mark(self.recent_traces, edges, 1)
+        changed = set(edges)
+        self.traces += 1
+        changed.update(self._slide(timestamp))
+
+        if len(self.reference) < self.min_traces or len(self.recent) < self.min_traces:
+            return None
+        if self.window_seconds is None and self._full:
+            self._update(changed)
+        else:
+            # timed windows change size, count windows just filled up
+            self._full = self.window_seconds is None
+            self.statistics.clear()
+            self._update(self.reference_traces.keys() | self.recent_traces.keys())
+        if self.reference[0][0] < self._quiet_until or not self.statistics:
+            return None
+        top = max(self.statistics.values())
+        p = self.last_p = min(1.0, chi2_sf(top, 1) * len(self.statistics))
+        if p >= self.significance:
+            return None
+
+        n1, n2 = len(self.reference), len(self.recent)
+        ranked = sorted(self.statistics, key=self.statistics.get, reverse=True)[:self.top_edges]
+        edges = [(a, b, self.reference_traces[a, b] / n1, self.recent_traces[a, b] / n2) for a, b in ranked]
+        drift = DriftPoint(self._change_point(ranked[0]), self.traces - 1, timestamp, p, edges)
+        self.drifts.append(drift)
+        self._quiet_until = drift.detected_at
+        return drift
+
+    def _slide(self, now):
+        # move / drop the traces that fell out of their window; returns the
+        # edges whose trace counts changed
+        recent, reference = self.recent, self.reference
+        moved = []
+        if self.window_seconds is None:
+            while len(recent) > self.window:
+                moved.append(self._move(recent, reference))
+            while len(reference) > self.window:
+                moved.append(self._drop(reference))
+        else:
+            while recent and recent[0][1] <= now - self.window_seconds:
+                moved.append(self._move(recent, reference))
+            while reference and reference[0][1] <= now - 2 * self.window_seconds:
+                moved.append(self._drop(reference))
+        return [edge for edges in moved for edge in edges]
+
+    def _move(self, recent, reference):
+        item = recent.popleft()
+        edges = item[2]
+        _add(self.recent_counts, edges, -1)
+        _mark(self.recent_traces, edges, -1)
+        reference.append(item)
+        _add(self.reference_counts, edges, 1)
+        _mark(self.reference_traces, edges, 1)
+        return edges
+
+    def _drop(self, reference):
+        edges = reference.popleft()[2]
+        _add(self.reference_counts, edges, -1)
+        _mark(self.reference_traces, edges, -1)
+        return edges
+
+    def _update(self, edges):
+        n1, n2 = len(self.reference), len(self.recent)
+        cache = self._g_cache if self._full else {}
+        for edge in edges:
+            k1, k2 = self.reference_traces.get(edge, 0), self.recent_traces.get(edge, 0)
+            if k1 or k2:
+                # with fixed window sizes G only depends on (k1, k2)
+                g = cache.get((k1, k2))
+                if g is None:
+                    if len(cache) >= 100_000:
+                        cache.clear()
+                    g = cache[k1, k2] = g_statistic(k1, n1, k2, n2)
+                self.statistics[edge] = g
+            else:
+                self.statistics.pop(edge, None)
+
+    def _change_point(self, edge):
+        # trace index where the cumulative deviation of `edge` from its mean
+        # over the recent window peaks; O(window), only run on a detection
+        hits = [edge in item[2] for item in self.recent]
+        mean = sum(hits) / len(hits)
+        best = position = total = 0.0
+        for i, hit in enumerate(hits):
+            total += hit - mean
+            if abs(total) > best:
+                best, position = abs(total), i + 1
+        return self.recent[min(int(position), len(hits) - 1)][0]
+
+    def add_traces(self, traces):
+        # iterable of activity sequences, or (activity sequence, timestamp)
+        # pairs for timed windows; returns the drift points found
+        found = []
+        for item in traces:
+            drift = self.add_trace(*item) if self.window_seconds is not None else self.add_trace(item)
+            if drift is not None:
+                found.append(drift)
+        return found
+
+    def add_xes(self, source):
+        # traces of an XES file or stream in file order, timed by their first event
+        found = []
+        for _, events in iter_traces(source, parse_timestamp_us):
+            stamps = [e['time:timestamp'] for e in events if 'time:timestamp' in e]
+            timestamp = stamps[0] / 1e6 if stamps else None
+            drift = self.add_trace([e['concept:name'] for e in events], timestamp)
+            if drift is not None:
+                found.append(drift)
+        return found
+
+    def windows(self):
+        # dependency_graph_file-shaped dicts of the reference and recent windows
+        return _graph(self.reference_counts), _graph(self.recent_counts)
+
+
+def _add(counts, edges, sign):
+    for edge, n in edges.items():
+        value = counts[edge] + sign * n
+        if value:
+            counts[edge] = value
+        else:
+            del counts[edge]
+
+
+def _mark(counts, edges, sign):
+    # one trace more (sign 1) or less (-1) for every edge it contains
+    for edge in edges:
+        value = counts[edge] + sign
+        if value:
+            counts[edge] = value
+        else:
+            del counts[edge]
+
+
+def _graph(counts):
+    graph = {}
+    for (a, b), n in counts.items():
+        graph.setdefault(a, {})[b] = n
+    return graph
+
+
+def detect_drift(log, window=200, window_seconds=None, **kwargs):
+    """Drift points of a whole EventLog (or read_from_file dictionary), with
+    traces in log order, or ordered by start time when the windows are timed
+    (trace indices then count in that order)."""
+    if not isinstance(log, EventLog):
+        log = EventLog.from_dictionary(log)
+    detector = DriftDetector(window, window_seconds, **kwargs)
+    if window_seconds is None:
+        return detector.add_traces(log.trace(i) for i in range(len(log)))
+    timed = []
+    for i in range(len(log)):
+        stamps = [ts for ts in log.timestamps[log.offsets[i]:log.offsets[i + 1]] if ts != MISSING]
+        if stamps:
+            timed.append((min(stamps) / 1e6, i))
+    timed.sort()
+    return detector.add_traces((log.trace(i), ts) for ts, i in timed)
@@ -0,0 +1,223 @@
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+
+from . import instrument
+from .xes_stream import iter_traces
+from .xes_time import parse_timestamp_us
+
+# ---- variant-compressed columnar event log ----
+# Activities and resources are interned to small integer codes, all events sit
+# in flat typed arrays (trace i is events[offsets[i]:offsets[i + 1]]) and every
+# distinct activity sequence is stored once as a variant with its multiplicity.
+
+MISSING = -2 ** 63  # value of an absent timestamp / cost
+NO_RESOURCE = 'N/A'  # placeholder log_as_dictionary puts in 'org:resource'
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(dt):
+    # naive wall-clock datetime (as read_from_file returns it) -> int
+    return (dt - EPOCH) // MICROSECOND
+
+
+def from_micros(value):
+    return EPOCH + value * MICROSECOND
+
+
+class EventLog:
+    def __init__(self):
+        self.activities = []
+        self.activity_codes = {}
+        self.resources = []
+        self.resource_codes = {}
+
+        self.case_ids = []
+        self.offsets = array('q', [0])
+        self.events = array('i')
+        self.timestamps = array('q')
+        self.costs = array('q')
+        self.event_resources = array('i')
+
+        self.trace_variants = array('i')
+        self._variant_index = {}
+        self.variant_offsets = array('q', [0])
+        self.variant_events = array('i')
+        self.variant_counts = array('q')
+
+    def __len__(self):
+        return len(self.case_ids)
+
+    @property
+    def num_events(self):
+        return len(self.events)
+
+    @property
+    def num_variants(self):
+        return len(self.variant_counts)
+
+    @property
+    def variant_index(self):
+        # activity code tuple -> variant id; logs read from columns
+        # (log_cache) rebuild it only once a trace is added
+        if self._variant_index is None:
+            self._variant_index = {tuple(self.variant_codes(v)): v for v in range(self.num_variants)}
+        return self._variant_index
+
+    def intern_activity(self, name):
+        code = self.activity_codes.get(name)
+        if code is None:
+            code = len(self.activities)
+            self.activity_codes[name] = code
+            self.activities.append(name)
+        return code
+
+    def intern_resource(self, name):
+        code = self.resource_codes.get(name)
+        if code is None:
+            code = len(self.resources)
+            self.resource_codes[name] = code
+            self.resources.append(name)
+        return code
+
+    def add_trace(self, case_id, events):
+        # events are dicts as returned by read_from_file ('concept:name', ...)
+        # or by log_as_dictionary ('job', 'timestamp', ...); timestamps may be
+        # datetimes or microseconds since 1970 already
+        codes = []
+        for e in events:
+            name = e.get('concept:name', e.get('job'))
+            if name is None:
+                continue
+            codes.append(self.intern_activity(name))
+            ts = e.get('time:timestamp', e.get('timestamp'))
+            if isinstance(ts, datetime):
+                ts = to_micros(ts)
+            self.timestamps.append(ts if isinstance(ts, int) else MISSING)
+            cost = e.get('cost')
+            self.costs.append(cost if isinstance(cost, int) else MISSING)
+            resource = e.get('org:resource')
+            if resource in (None, NO_RESOURCE):
+                resource = e.get('user')  # log_as_dictionary keeps the performer here
+            missing = resource in (None, NO_RESOURCE)
+            self.event_resources.append(-1 if missing else self.intern_resource(resource))
+        self._append_codes(case_id, codes)
+
+    def add_activity_trace(self, case_id, trace):
+        # activity names only, no per-event attributes
+        codes = [self.intern_activity(name) for name in trace]
+        self.timestamps.extend([MISSING] * len(codes))
+        self.costs.extend([MISSING] * len(codes))
+        self.event_resources.extend([-1] * len(codes))
+        self._append_codes(case_id, codes)
+
+    def _append_codes(self, case_id, codes):
+        self.case_ids.append(case_id)
+        self.events.extend(codes)
+        self.offsets.append(len(self.events))
+        key = tuple(codes)
+        vid = self.variant_index.get(key)
+        if vid is None:
+            vid = len(self.variant_counts)
+            self.variant_index[key] = vid
+            self.variant_events.extend(codes)
+            self.variant_offsets.append(len(self.variant_events))
+            self.variant_counts.append(0)
+        self.variant_counts[vid] += 1
+        self.trace_variants.append(vid)
+
+    # ---- access ----
+
+    def trace_codes(self, i):
+        return self.events[self.offsets[i]:self.offsets[i + 1]]
+
+    def trace(self, i):
+        return tuple(self.activities[c] for c in self.trace_codes(i))
+
+    def variant_codes(self, v):
+        return self.variant_events[self.variant_offsets[v]:self.variant_offsets[v + 1]]
+
+    def variant(self, v):
+        return tuple(self.activities[c] for c in self.variant_codes(v))
+
+    def iter_variants(self):
+        # (activity tuple, multiplicity) in order of first occurrence
+        for v in range(self.num_variants):
+            yield self.variant(v), self.variant_counts[v]
+
+    def variant_counter(self):
+        return Counter(dict(self.iter_variants()))
+
+    def event_dict(self, index):
+        event = {'concept:name': self.activities[self.events[index]]}
+        if self.event_resources[index] >= 0:
+            event['org:resource'] = self.resources[self.event_resources[index]]
+        if self.costs[index] != MISSING:
+            event['cost'] = self.costs[index]
+        if self.timestamps[index] != MISSING:
+            event['time:timestamp'] = from_micros(self.timestamps[index])
+        return event
+
+    def to_dictionary(self):
+        # back to the read_from_file shape: case id -> list of event dicts
+        log = {}
+        for i, case_id in enumerate(self.case_ids):
+            log[case_id] = [self.event_dict(j) for j in range(self.offsets[i], self.offsets[i + 1])]
+        return log
+
+    def nbytes(self):
+        # size of the array columns (the dictionaries are not counted)
+        columns = (self.offsets, self.events, self.timestamps, self.costs, self.event_resources,
+                   self.trace_variants, self.variant_offsets, self.variant_events, self.variant_counts)
+        return sum(a.itemsize * len(a) for a in columns)
+
+    # ---- construction ----
+
+    @classmethod
+    def from_xes(cls, filename):
+        # same traces as Process_mining_Ex_2.read_from_file, including the
+        # merge of traces that share a case id
+        log = cls()
+        with instrument.timer("xes.parse"):
+            for case_id, events in iter_traces(filename, parse_timestamp_us):
+                if case_id:
+                    log.add_trace(case_id, events)
+            return log.merge_duplicate_cases()
+
+    @classmethod
+    def from_dictionary(cls, log_dict):
+        log = cls()
+        for case_id, events in log_dict.items():
+            log.add_trace(case_id, events)
+        return log
+
+    @classmethod
+    def from_traces(cls, traces):
+        # list of activity tuples (Process_mining_Ex_4.read_from_file)
+        log = cls()
+        for i, trace in enumerate(traces):
+            log.add_activity_trace(i, trace)
+        return log
+
+    def merge_duplicate_cases(self):
+        first = {}
+        for i, case_id in enumerate(self.case_ids):
+            first.setdefault(case_id, []).append(i)
+        if len(first) == len(self.case_ids):
+            return self
+        merged = EventLog()
+        merged.activities = self.activities
+        merged.activity_codes = self.activity_codes
+        merged.resources = self.resources
+        merged.resource_codes = self.resource_codes
+        for case_id, parts in first.items():
+            codes = []
+            for i in parts:
+                lo, hi = self.offsets[i], self.offsets[i + 1]
+                codes.extend(self.events[lo:hi])
+                merged.timestamps.extend(self.timestamps[lo:hi])
+                merged.costs.extend(self.costs[lo:hi])
+                merged.event_resources.extend(self.event_resources[lo:hi])
+            merged._append_codes(case_id, codes)
+        return merged
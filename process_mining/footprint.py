@@ -0,0 +1,144 @@
+from collections import Counter
+
+from .event_log import EventLog
+
+# ---- Alpha miner footprint as bit matrices ----
+# Activities are numbered in order of first appearance and every relation is
+# a list of Python ints used as bit rows: bit j of succ[i] is set when
+# activity i is directly followed by activity j somewhere in the log.
+# Causality, parallel and choice rows are derived from succ and its
+# transpose with a handful of bitwise operations per activity.
+
+
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Footprint:
+    def __init__(self, activities=(), extended=False):
+        self.activities = []
+        self.index = {}
+        self.succ = []
+        self.starts = 0
+        self.ends = 0
+        self.variants = 0  # distinct traces added by from_traces / from_log
+        # extended mode (alpha_places.extended_places) also keeps, per trace
+        # variant: the triples (x, t, y) of the trace with repeats collapsed
+        # (-1 for start/end), the distinct masks of activities seen before
+        # the first / after the last occurrence of every activity, and the
+        # activities occurring twice in some trace; and per activity the
+        # number of traces it occurs in and directly follows itself in
+        self.extended = extended
+        self.bridges = set()
+        self.before = []
+        self.after = []
+        self.repeats = 0
+        self.occurs = []
+        self.doubled = []
+        for a in activities:
+            self._code(a)
+
+    def _code(self, name):
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.activities)
+            self.activities.append(name)
+            self.succ.append(0)
+            self.before.append(set())
+            self.after.append(set())
+            self.occurs.append(0)
+            self.doubled.append(0)
+        return i
+
+    def add_trace(self, trace, count=1):
+        # one pass per trace (variant); relations are derived afterwards
+        self.add_codes([self._code(a) for a in trace], count)
+
+    def add_codes(self, codes, count=1):
+        # count: multiplicity of the trace, only used in extended mode
+        if not codes:
+            return
+        self.starts |= 1 << codes[0]
+        self.ends |= 1 << codes[-1]
+        for a, b in zip(codes, codes[1:]):
+            self.succ[a] |= 1 << b
+        if self.extended:
+            self._add_context(codes, count)
+
+    def _add_context(self, codes, count):
+        runs = [-1]
+        seen = 0
+        for a in codes:
+            bit = 1 << a
+            if seen & bit:
+                self.repeats |= bit
+            else:
+                self.before[a].add(seen)
+            seen |= bit
+            if a != runs[-1]:
+                runs.append(a)
+        runs.append(-1)
+        for a in set(codes):
+            self.occurs[a] += count
+        for a in {a for a, b in zip(codes, codes[1:]) if a == b}:
+            self.doubled[a] += count
+        self.bridges.update(zip(runs, runs[1:], runs[2:]))
+        later = 0
+        done = 0
+        for a in reversed(codes):
+            bit = 1 << a
+            if not done & bit:
+                self.after[a].add(later)
+                done |= bit
+            later |= bit
+
+    @classmethod
+    def from_traces(cls, traces, extended=False):
+        # repeated traces add nothing to the relations, so each is added once
+        # (with its count)
+        fp = cls(extended=extended)
+        seen = Counter(tuple(trace) for trace in traces)
+        for trace, count in seen.items():
+            fp.add_trace(trace, count)
+        fp.variants = len(seen)
+        return fp.derive()
+
+    @classmethod
+    def from_log(cls, log, extended=False):
+        # EventLog: one pass over the variant codes, activity codes are kept
+        if not isinstance(log, EventLog):
+            return cls.from_traces(log, extended)
+        fp = cls(log.activities, extended)
+        for v in range(log.num_variants):
+            fp.add_codes(log.variant_codes(v), log.variant_counts[v])
+        fp.variants = log.num_variants
+        return fp.derive()
+
+    def derive(self):
+        n = len(self.activities)
+        full = (1 << n) - 1
+        self.pred = [0] * n
+        for a in range(n):
+            for b in iter_bits(self.succ[a]):
+                self.pred[b] |= 1 << a
+        # a -> b, a || b, a # b (no self bits in choice)
+        self.causal = [self.succ[a] & ~self.pred[a] for a in range(n)]
+        self.parallel = [self.succ[a] & self.pred[a] for a in range(n)]
+        self.choice = [full & ~(self.succ[a] | self.pred[a]) & ~(1 << a) for a in range(n)]
+        return self
+
+    # ---- name based views ----
+
+    def names(self, mask):
+        return [self.activities[i] for i in iter_bits(mask)]
+
+    def is_causal(self, a, b):
+        i, j = self.index.get(a), self.index.get(b)
+        return i is not None and j is not None and bool(self.causal[i] >> j & 1)
+
+    def causality(self):
+        return {(self.activities[a], self.activities[b]) for a in range(len(self.activities))
+                for b in iter_bits(self.causal[a])}
@@ -0,0 +1,60 @@
+from collections import defaultdict
+
+from .xes_stream import iter_traces
+
+# ---- incremental directly-follows graph ----
+# Keeps the last activity of every open case, so each new event adds at most
+# one edge count in O(1). graph has the same shape as the dicts returned by
+# dependency_graph_inline / dependency_graph_file in Process_mining_Ex_2.py.
+
+
+class IncrementalDFG:
+    def __init__(self):
+        self.graph = defaultdict(lambda: defaultdict(int))
+        self.last_activity = {}
+        self.events = 0
+
+    def add_event(self, case_id, activity):
+        prev = self.last_activity.get(case_id)
+        if prev is not None:
+            self.graph[prev][activity] += 1
+        self.last_activity[case_id] = activity
+        self.events += 1
+
+    def add_events(self, events):
+        # iterable of (case_id, activity), in arrival order
+        for case_id, activity in events:
+            self.add_event(case_id, activity)
+
+    def add_log_dictionary(self, log):
+        # log_as_dictionary ('job') or read_from_file ('concept:name') output
+        for case_id, entries in log.items():
+            for entry in entries:
+                self.add_event(case_id, entry.get('concept:name', entry.get('job')))
+
+    def add_xes(self, source, close_cases=False):
+        """Add every event of an XES file or stream.
+
+        Cases stay open by default, so a later trace with the same case id
+        continues it as read_from_file does; close_cases drops each case once
+        its trace is done, which keeps memory bounded on huge logs.
+        """
+        for case_id, events in iter_traces(source):
+            if not case_id:
+                continue
+            for event in events:
+                self.add_event(case_id, event['concept:name'])
+            if close_cases:
+                self.close_case(case_id)
+
+    def close_case(self, case_id):
+        # the case will not get more events; forget its last activity
+        self.last_activity.pop(case_id, None)
+
+    @property
+    def open_cases(self):
+        return len(self.last_activity)
+
+    def snapshot(self):
+        # plain-dict copy of the edge counts, O(edges) and independent of events
+        return {source: dict(targets) for source, targets in self.graph.items()}
@@ -0,0 +1,147 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# ---- stage timers, counters and an optional sampling profiler ----
+# Off by default. While disabled timer() hands back one shared no-op context
+# manager and count() returns right away, so the hooks cost a function call
+# per stage (not per event) and can stay in production code. Stages record
+# calls, total and max wall time; counters hold event / trace / variant
+# numbers per stage. With sample_interval a daemon thread samples the stack
+# of the enabling thread and counts (stage, function) pairs.
+#
+# PM_INSTRUMENT=1 enables it at import (PM_INSTRUMENT_SAMPLE=seconds with the
+# sampler), PM_INSTRUMENT_REPORT=path also writes the JSON report there when
+# the process exits.
+
+enabled = False
+timers = {}          # name -> [calls, total seconds, max seconds]
+counters = Counter()
+samples = Counter()  # (stage, "file:function:line") -> samples
+_stages = []         # names of the running timers, innermost last
+_sampler = None
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        _stages.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        _stages.pop()
+        stat = timers.get(self.name)
+        if stat is None:
+            timers[self.name] = [1, elapsed, elapsed]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed
+            if elapsed > stat[2]:
+                stat[2] = elapsed
+        return False
+
+
+def timer(name):
+    # with instrument.timer("alpha.footprint"): ...
+    if not enabled:
+        return _NULL
+    return _Timer(name)
+
+
+def count(name, n=1):
+    if enabled:
+        counters[name] += n
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, thread_id, interval):
+        super().__init__(name="instrument-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            code = frame.f_code
+            where = f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+            # slicing does not race with the stage stack being popped
+            stage = (_stages[-1:] or [None])[0]
+            samples[stage, where] += 1
+
+
+def enable(sample_interval=None):
+    """Start recording. sample_interval (seconds) also starts the sampling
+    profiler on the calling thread."""
+    global enabled, _sampler
+    enabled = True
+    if sample_interval and _sampler is None:
+        _sampler = _Sampler(threading.get_ident(), sample_interval)
+        _sampler.start()
+
+
+def disable():
+    global enabled, _sampler
+    enabled = False
+    if _sampler is not None:
+        _sampler.stopped.set()
+        _sampler.join()
+        _sampler = None
+
+
+def reset():
+    timers.clear()
+    counters.clear()
+    samples.clear()
+
+
+def report(top=50):
+    # machine-readable summary; events per second for stages with an
+    # "<stage>.events" counter
+    stages = {}
+    for name, (calls, total, longest) in sorted(timers.items()):
+        stage = {"calls": calls, "total_s": round(total, 6), "max_s": round(longest, 6)}
+        events = counters.get(f"{name}.events")
+        if events and total:
+            stage["events_per_s"] = round(events / total)
+        stages[name] = stage
+    return {
+        "stages": stages,
+        "counters": dict(sorted(counters.items())),
+        "samples": [{"stage": stage, "frame": where, "count": n}
+                    for (stage, where), n in samples.most_common(top)],
+    }
+
+
+def write_report(path, top=50):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(top), f, indent=2)
+
+
+if os.environ.get("PM_INSTRUMENT"):
+    enable(float(os.environ.get("PM_INSTRUMENT_SAMPLE", 0)) or None)
+    if os.environ.get("PM_INSTRUMENT_REPORT"):
+        atexit.register(write_report, os.environ["PM_INSTRUMENT_REPORT"])
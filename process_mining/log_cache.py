@@ -0,0 +1,254 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+
+from .event_log import EventLog
+
+# ---- binary EventLog files + on-disk cache of parsed XES logs ----
+# File layout: magic, format version, length of a JSON header (activity and
+# resource dictionaries, column table) and then the raw array columns, each
+# 8-byte aligned. Loading maps the file and casts memoryviews over the
+# columns, so no element is parsed again: string case ids are an offsets
+# column plus a utf-8 column and are decoded one at a time when accessed.
+# write_columns / read_columns implement the layout for any magic and set of
+# columns (model_io stores Petri nets the same way).
+
+MAGIC = b"PMLG"
+VERSION = 2
+PREFIX = struct.Struct("<4sIQ")
+COLUMNS = ("offsets", "events", "timestamps", "costs", "event_resources",
+           "trace_variants", "variant_offsets", "variant_events", "variant_counts")
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def write_columns(path, magic, version, meta, columns):
+    """Write the JSON-able meta dict plus the {name: array or memoryview}
+    columns, in order; meta gets a "columns" table of (typecode, offset,
+    length). The file is written next to path and renamed, so readers never
+    see half a file."""
+    table = {}
+    pos = 0
+    for name, column in columns.items():
+        table[name] = [column.format if isinstance(column, memoryview) else column.typecode, pos, len(column)]
+        pos = _align(pos + column.itemsize * len(column))
+    header = json.dumps(dict(meta, columns=table)).encode("utf-8")
+    data_start = _align(PREFIX.size + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(PREFIX.pack(magic, version, len(header)))
+            f.write(header)
+            for name, column in columns.items():
+                f.seek(data_start + table[name][1])
+                f.write(column.tobytes())
+            f.truncate(data_start + pos)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def read_columns(path, magic, version, kind, use_mmap=True):
+    """(meta, {name: memoryview}, buffer) of a file written by write_columns.
+    The views are over the mapped file (use_mmap) or over its bytes; the
+    buffer has to stay alive as long as they are used. Files with another
+    magic or version, or cut short, raise ValueError."""
+    with open(path, "rb") as f:
+        prefix = f.read(PREFIX.size)
+        if len(prefix) < PREFIX.size:
+            raise ValueError(f"{path} is truncated")
+        file_magic, file_version, header_len = PREFIX.unpack(prefix)
+        if file_magic != magic:
+            raise ValueError(f"{path} is not a valid {kind} file")
+        if file_version != version:
+            raise ValueError(f"{path}: unsupported {kind} format version {file_version}")
+        meta = json.loads(f.read(header_len))
+        data_start = _align(PREFIX.size + header_len)
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if use_mmap else f.read()
+
+    view = memoryview(buf)
+    base = data_start if use_mmap else data_start - PREFIX.size - header_len
+    columns = {}
+    for name, (typecode, offset, length) in meta["columns"].items():
+        size = array(typecode).itemsize * length
+        if base + offset + size > len(view):
+            raise ValueError(f"{path} is truncated")
+        columns[name] = view[base + offset:base + offset + size].cast(typecode)
+    return meta, columns, buf
+
+
+class StringColumn(Sequence):
+    """Read-only sequence of the strings packed in an offsets column and a
+    utf-8 bytes column; items are decoded when accessed."""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("string column index out of range")
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+def _case_id_columns(case_ids):
+    # integer ids (EventLog.from_traces) as one column, strings as two
+    if all(type(c) is int for c in case_ids):
+        return "int", {"case_ids": array('q', case_ids)}
+    if not all(isinstance(c, str) for c in case_ids):
+        raise ValueError("case ids must be all strings or all integers to be stored")
+    encoded = [c.encode("utf-8") for c in case_ids]
+    offsets = array('q', [0])
+    offsets.extend(accumulate(map(len, encoded)))
+    return "str", {"case_id_offsets": offsets, "case_id_bytes": array('B', b"".join(encoded))}
+
+
+def dump_event_log(log, path):
+    case_id_type, case_id_columns = _case_id_columns(log.case_ids)
+    meta = {"activities": log.activities, "resources": log.resources, "case_ids": case_id_type}
+    columns = {name: getattr(log, name) for name in COLUMNS}
+    columns.update(case_id_columns)
+    write_columns(path, MAGIC, VERSION, meta, columns)
+
+
+def load_event_log(path, use_mmap=True):
+    """Read a file written by dump_event_log.
+
+    With use_mmap the columns are read-only memoryviews over the mapped file,
+    otherwise they are copied into arrays (and the log can be extended).
+    """
+    meta, columns, buf = read_columns(path, MAGIC, VERSION, "event log", use_mmap)
+    log = EventLog()
+    log.activities = meta["activities"]
+    log.activity_codes = {a: i for i, a in enumerate(log.activities)}
+    log.resources = meta["resources"]
+    log.resource_codes = {r: i for i, r in enumerate(log.resources)}
+    for name in COLUMNS:
+        setattr(log, name, columns[name] if use_mmap else array(columns[name].format, columns[name]))
+    if meta["case_ids"] == "int":
+        case_ids = columns["case_ids"]
+        log.case_ids = case_ids if use_mmap else array('q', case_ids)
+    else:
+        case_ids = StringColumn(columns["case_id_offsets"], columns["case_id_bytes"])
+        log.case_ids = case_ids if use_mmap else list(case_ids)
+    log._variant_index = None  # rebuilt from the variant columns if a trace is added
+    log._buffer = buf  # keeps the mapping alive as long as the log
+    return log
+
+
+class LogCache:
+    """Opt-in cache of parsed XES logs.
+
+    Entries are keyed by the file's content hash; an index remembers path,
+    size and mtime so an unchanged file is not hashed again. The least
+    recently used entries are evicted once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, directory=None, max_bytes=2 * 2 ** 30):
+        if directory is None:
+            directory = os.environ.get("PM_LOG_CACHE") or os.path.join(
+                os.path.expanduser("~"), ".cache", "process_mining")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._index_path = os.path.join(directory, "index.json")
+
+    def _read_index(self):
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp, self._index_path)
+
+    def _entry_path(self, digest):
+        return os.path.join(self.directory, digest + ".pmlog")
+
+    def digest(self, filename):
+        path = os.path.abspath(filename)
+        st = os.stat(path)
+        index = self._read_index()
+        rec = index.get(path)
+        if rec and rec["size"] == st.st_size and rec["mtime_ns"] == st.st_mtime_ns:
+            return rec["digest"]
+        h = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        index[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": h.hexdigest()}
+        self._write_index(index)
+        return h.hexdigest()
+
+    def load(self, filename, use_mmap=True):
+        entry = self._entry_path(self.digest(filename))
+        try:
+            log = load_event_log(entry, use_mmap)
+            os.utime(entry)  # mtime doubles as last access for eviction
+            return log
+        except (OSError, ValueError):
+            pass
+        log = EventLog.from_xes(filename)
+        dump_event_log(log, entry)
+        self.evict()
+        return log
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pmlog"):
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime_ns, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.unlink(os.path.join(self.directory, name))
+            total -= size
+
+    def invalidate(self, filename):
+        path = os.path.abspath(filename)
+        index = self._read_index()
+        rec = index.pop(path, None)
+        if rec is None:
+            return False
+        self._write_index(index)
+        try:
+            os.unlink(self._entry_path(rec["digest"]))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".pmlog") or name == "index.json":
+                os.unlink(os.path.join(self.directory, name))
+
+
+def read_event_log(filename, cache=None):
+    # EventLog.from_xes, served from the cache when one is given
+    if cache is None:
+        return EventLog.from_xes(filename)
+    return cache.load(filename)
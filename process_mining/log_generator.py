@@ -0,0 +1,145 @@
+import random
+from datetime import datetime, timedelta
+from xml.sax.saxutils import quoteattr
+
+from .Process_mining_Ex_4 import alpha
+
+# ---- synthetic XES logs played out from a PetriNet ----
+# Traces are random firing sequences of an Ex_4 PetriNet: starting from the
+# initial marking an enabled transition is picked uniformly until the end
+# place is marked (or nothing is enabled). A pool of distinct clean traces
+# (the variants) is simulated first and the log samples from it with Zipf
+# weights, as real logs have a few frequent and many rare variants. Noise
+# (drop / duplicate / swap events) is applied per trace on top, so noisy logs
+# have more variants than the pool. Files get the attributes and layout of
+# extension-log-4.xes.
+
+EPOCH = datetime(1970, 1, 1)  # write_xes: every case starts an hour after this
+
+HEADER = """<?xml version="1.0" encoding="UTF-8" ?>
+<log xes.version="1.0" xes.features="nested-attributes" openxes.version="1.0RC7" xmlns="http://www.xes-standard.org/">
+\t<extension name="Organizational" prefix="org" uri="http://www.xes-standard.org/org.xesext"/>
+\t<extension name="Time" prefix="time" uri="http://www.xes-standard.org/time.xesext"/>
+\t<extension name="Lifecycle" prefix="lifecycle" uri="http://www.xes-standard.org/lifecycle.xesext"/>
+\t<extension name="Concept" prefix="concept" uri="http://www.xes-standard.org/concept.xesext"/>
+\t<string key="concept:name" value="tmp-process"/>
+"""
+
+
+def play(pn, rng, max_length=100):
+    # one random firing sequence (activity names) of the net
+    net = pn.compile()
+    names = [pn.transitions[tid]["name"] for tid in net.transition_ids]
+    marking = list(net.initial)
+    trace = []
+    while len(trace) < max_length:
+        if net.end >= 0 and marking[net.end] > 0:
+            break
+        enabled = [t for t in range(len(names)) if net.inputs[t] and net.is_enabled(marking, t)]
+        if not enabled:
+            break
+        t = rng.choice(enabled)
+        net.fire(marking, t)
+        trace.append(names[t])
+    return tuple(trace)
+
+
+def add_noise(trace, rng):
+    # a few random drops, duplicates and swaps
+    trace = list(trace)
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(trace))
+        op = rng.random()
+        if op < 0.3 and len(trace) > 1:
+            del trace[i]
+        elif op < 0.6:
+            trace.insert(i, trace[rng.randrange(len(trace))])
+        else:
+            j = rng.randrange(len(trace))
+            trace[i], trace[j] = trace[j], trace[i]
+    return tuple(trace)
+
+
+def block_net(activities, seed=0, traces=None):
+    """Random block-structured net (sequences, XOR choices, parallel blocks of
+    up to three activities) over activities a0, a1, ..., mined by alpha from a
+    sample large enough to show every directly-follows pair.
+
+    Parallel blocks never open or close the process and never follow each
+    other directly: without silent transitions alpha would join them into a
+    net that deadlocks.
+    """
+    rng = random.Random(seed)
+    blocks, i = [], 0
+    while i < activities:
+        after_and = blocks and blocks[-1][0] == "and"
+        kind = rng.choice(["seq", "xor"] if not blocks or after_and else ["seq", "xor", "and"])
+        width = 1 if kind == "seq" else min(rng.randint(2, 3), activities - i)
+        if kind == "and" and i + width >= activities:
+            kind = "xor"
+        blocks.append((kind, [f"a{j}" for j in range(i, i + width)]))
+        i += width
+
+    def sample():
+        trace = []
+        for kind, acts in blocks:
+            if kind == "xor":
+                trace.append(rng.choice(acts))
+            elif kind == "and":
+                trace.extend(rng.sample(acts, len(acts)))
+            else:
+                trace.extend(acts)
+        return tuple(trace)
+
+    return alpha([sample() for _ in range(traces or 100 * activities)])
+
+
+def generate_traces(pn, traces, variants=100, noise=0.0, seed=0, max_length=100):
+    """traces activity tuples from pn: at most `variants` distinct clean ones,
+    each trace made noisy with probability `noise`."""
+    rng = random.Random(seed)
+    pool, seen = [], set()
+    attempts = 0
+    while len(pool) < variants and attempts < 20 * variants:
+        attempts += 1
+        trace = play(pn, rng, max_length)
+        if trace and trace not in seen:
+            seen.add(trace)
+            pool.append(trace)
+    if not pool:
+        raise ValueError("the net does not produce any trace")
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    for trace in rng.choices(pool, weights, k=traces):
+        if noise and rng.random() < noise:
+            trace = add_noise(trace, rng)
+        yield trace
+
+
+def write_xes(path, traces, seed=0, resources=5):
+    # events carry org:resource, cost, concept:name and time:timestamp; every
+    # case starts at 01:00 and events are one hour apart, like the bundled logs
+    rng = random.Random(seed)
+    events = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        for case, trace in enumerate(traces):
+            out = ["\t<trace>\n", f'\t\t<string key="concept:name" value="case_{case}"/>\n']
+            for hour, activity in enumerate(trace, 1):
+                timestamp = (EPOCH + timedelta(hours=hour)).isoformat()
+                out.append(
+                    "\t\t<event>\n"
+                    f'\t\t\t<string key="org:resource" value="user-{rng.randrange(resources)}"/>\n'
+                    f'\t\t\t<int key="cost" value="{rng.randint(10, 500)}"/>\n'
+                    f"\t\t\t<string key=\"concept:name\" value={quoteattr(activity)}/>\n"
+                    f'\t\t\t<date key="time:timestamp" value="{timestamp}+01:00"/>\n'
+                    "\t\t</event>\n")
+            out.append("\t</trace>\n")
+            f.write("".join(out))
+            events += len(trace)
+        f.write("</log>\n")
+    return events
+
+
+def generate_xes(path, pn, traces, variants=100, noise=0.0, seed=0):
+    # returns the number of events written
+    return write_xes(path, generate_traces(pn, traces, variants, noise, seed), seed)
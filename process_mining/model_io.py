@@ -0,0 +1,170 @@
+from array import array
+from collections import Counter
+from xml.sax.saxutils import escape, quoteattr
+
+from .event_log import EventLog
+from .log_cache import dump_event_log, load_event_log, read_columns, write_columns
+from .Process_mining_Ex_4 import CompiledNet, PetriNet, to_petri_net
+
+# ---- binary PetriNet files, variant logs and PNML export ----
+# Same layout as the log_cache files (log_cache.write_columns): magic, format
+# version, length of a JSON header (place names, transition ids and labels,
+# start / end place, activity index, column table) and the raw integer
+# columns, each 8-byte aligned: the initial marking per place and the input /
+# output arcs as CSR arrays (offsets per transition into flat place-index
+# arrays, in the order CompiledNet uses). load_compiled maps the file and
+# builds the CompiledNet straight from the columns, without a PetriNet and
+# without re-mining.
+# Variant logs are EventLog files (log_cache format) holding only the
+# variant columns: every distinct trace once, with its frequency.
+
+MAGIC = b"PMNT"
+VERSION = 1
+
+
+def dump_petri_net(pn, path):
+    pn = to_petri_net(pn)
+    net = pn.compile()
+    columns = {
+        "initial": array('i', net.initial),
+        "input_offsets": array('q', [0]),
+        "inputs": array('i'),
+        "output_offsets": array('q', [0]),
+        "outputs": array('i'),
+    }
+    for arcs, flat, offsets in ((net.inputs, "inputs", "input_offsets"),
+                                (net.outputs, "outputs", "output_offsets")):
+        for places in arcs:
+            columns[flat].extend(places)
+            columns[offsets].append(len(columns[flat]))
+    meta = {
+        "places": net.place_names,
+        "transitions": net.transition_ids,
+        "labels": [pn.transitions[tid]["name"] for tid in net.transition_ids],
+        "activity_index": net.activity_index,
+        "start_place": pn.start_place,
+        "end_place": pn.end_place,
+    }
+    write_columns(path, MAGIC, VERSION, meta, columns)
+
+
+def _read(path, use_mmap):
+    # (header, {column name: memoryview}); the columns are copied out by
+    # _compiled, so the buffer is not kept
+    meta, columns, _ = read_columns(path, MAGIC, VERSION, "Petri net", use_mmap)
+    return meta, columns
+
+
+def _arcs(offsets, places):
+    return tuple(tuple(places[offsets[t]:offsets[t + 1]]) for t in range(len(offsets) - 1))
+
+
+def load_compiled(path, use_mmap=True):
+    """CompiledNet of a file written by dump_petri_net, ready for replay and
+    for worker processes, without building the PetriNet."""
+    return _compiled(*_read(path, use_mmap))
+
+
+def _compiled(meta, columns):
+    net = CompiledNet.__new__(CompiledNet)
+    net.place_names = meta["places"]
+    net.transition_ids = meta["transitions"]
+    net.activity_index = meta["activity_index"]
+    net.inputs = _arcs(columns["input_offsets"], columns["inputs"])
+    net.outputs = _arcs(columns["output_offsets"], columns["outputs"])
+    net.n_inputs = tuple(map(len, net.inputs))
+    net.n_outputs = tuple(map(len, net.outputs))
+    net.initial = columns["initial"].tolist()
+    net.initial_marking = {net.place_names[p]: v for p, v in enumerate(net.initial) if v}
+    net.initial_tokens = sum(net.initial)
+    net.end_place = meta["end_place"]
+    net.end = net.place_names.index(net.end_place) if net.end_place in net.place_names else -1
+    return net
+
+
+def load_petri_net(path, use_mmap=True):
+    """Ex_4 PetriNet of a file written by dump_petri_net. The compiled net is
+    attached, so pn.compile() costs nothing until the net is changed."""
+    meta, columns = _read(path, use_mmap)
+    net = _compiled(meta, columns)
+    pn = PetriNet()
+    for name, tokens in zip(net.place_names, net.initial):
+        pn.add_place(name, tokens)
+    for t, (tid, label) in enumerate(zip(net.transition_ids, meta["labels"])):
+        pn.add_transition(label, tid)
+        for p in net.inputs[t]:
+            pn.add_edge(net.place_names[p], tid)
+        for p in net.outputs[t]:
+            pn.add_edge(tid, net.place_names[p])
+    pn.start_place = meta["start_place"]
+    pn.end_place = meta["end_place"]
+    pn._compiled = net
+    return pn
+
+
+# ---- variant-compressed logs ----
+
+def variant_log(log):
+    """EventLog with only the variant columns of log (an EventLog, a list of
+    activity tuples or a Counter of them): no cases, no event attributes."""
+    trace_counts = log.variant_counter() if isinstance(log, EventLog) else Counter(log)
+    compressed = EventLog()
+    for trace, count in trace_counts.items():
+        _add_variant(compressed, trace, count)
+    return compressed
+
+
+def _add_variant(log, trace, count):
+    codes = tuple(log.intern_activity(a) for a in trace)
+    vid = log.variant_index.get(codes)
+    if vid is None:
+        vid = log.variant_index[codes] = len(log.variant_counts)
+        log.variant_events.extend(codes)
+        log.variant_offsets.append(len(log.variant_events))
+        log.variant_counts.append(0)
+    log.variant_counts[vid] += count
+
+
+def dump_variants(log, path):
+    dump_event_log(variant_log(log), path)
+
+
+def load_variants(path, use_mmap=True):
+    # EventLog whose variant_counter() / iter_variants() feed the replay functions
+    return load_event_log(path, use_mmap)
+
+
+# ---- PNML ----
+
+def write_pnml(pn, path, net_id="net1"):
+    """Place/transition net in PNML (ISO/IEC 15909-2), readable by ProM, PM4Py
+    and other tools. Transition labels go into the name elements."""
+    pn = to_petri_net(pn)
+    net = pn.compile()
+    out = ['<?xml version="1.0" encoding="UTF-8"?>\n<pnml>\n',
+           f'  <net id={quoteattr(net_id)} type="http://www.pnml.org/version-2009/grammar/ptnet">\n',
+           '    <page id="page1">\n']
+    for p, name in enumerate(net.place_names):
+        out.append(f"      <place id={quoteattr(name)}>\n"
+                   f"        <name><text>{escape(name)}</text></name>\n")
+        if net.initial[p]:
+            out.append(f"        <initialMarking><text>{net.initial[p]}</text></initialMarking>\n")
+        out.append("      </place>\n")
+    for tid in net.transition_ids:
+        out.append(f"      <transition id={quoteattr(tid)}>\n"
+                   f"        <name><text>{escape(pn.transitions[tid]['name'])}</text></name>\n"
+                   "      </transition>\n")
+    arc = 0
+    for t, tid in enumerate(net.transition_ids):
+        for source, target in ([(net.place_names[p], tid) for p in net.inputs[t]]
+                               + [(tid, net.place_names[p]) for p in net.outputs[t]]):
+            out.append(f"      <arc id=\"a{arc}\" source={quoteattr(source)} target={quoteattr(target)}/>\n")
+            arc += 1
+    out.append("    </page>\n")
+    if net.end >= 0:
+        out.append("    <finalmarkings>\n      <marking>\n"
+                   f"        <place idref={quoteattr(net.end_place)}><text>1</text></place>\n"
+                   "      </marking>\n    </finalmarkings>\n")
+    out.append("  </net>\n</pnml>\n")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(out))
@@ -0,0 +1,53 @@
+import os
+from collections import Counter
+from multiprocessing import Pool
+
+from .event_log import EventLog
+from .Process_mining_Ex_4 import fitness_from_counts, fitness_token_replay
+
+# ---- multi-process token replay ----
+# Every variant replays from the initial marking, so variants can be split
+# into shards and replayed independently. Each worker receives the compiled
+# net once (pool initializer) and returns the m/c/p/r sums of its shards.
+
+_net = None
+
+
+def _init_worker(net):
+    global _net
+    _net = net
+
+
+def _replay_shard(shard):
+    m = c = p = r = 0
+    for trace, count in shard:
+        tm, tc, tp, tr = _net.replay(trace)
+        m += tm * count
+        c += tc * count
+        p += tp * count
+        r += tr * count
+    return m, c, p, r
+
+
+def fitness_token_replay_parallel(log, pn, workers=None, chunk_size=500, min_variants=2000):
+    """fitness_token_replay with the variants spread over a process pool.
+
+    Logs with fewer than min_variants variants (or workers <= 1) are replayed
+    serially, since starting the pool would cost more than it saves.
+    """
+    trace_counts = log.variant_counter() if isinstance(log, EventLog) else Counter(log)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(trace_counts) < min_variants:
+        return fitness_token_replay(log, pn)
+
+    items = list(trace_counts.items())
+    shards = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    total_m = total_c = total_p = total_r = 0
+    with Pool(min(workers, len(shards)), initializer=_init_worker, initargs=(pn.compile(),)) as pool:
+        for m, c, p, r in pool.imap_unordered(_replay_shard, shards):
+            total_m += m
+            total_c += c
+            total_p += p
+            total_r += r
+    return fitness_from_counts(float(total_m), float(total_c), float(total_p), float(total_r))
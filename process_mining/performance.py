@@ -0,0 +1,227 @@
+import math
+from collections import defaultdict
+
+import numpy as np
+
+from .event_log import MISSING, EventLog
+
+# ---- performance analytics over the columnar event log ----
+# One pass over the EventLog arrays in chunks of whole traces: waiting times
+# between directly following events per dependency-graph edge, case
+# throughput times, events and cost per resource and cost per activity. Each
+# chunk is handled with a few numpy operations, so memory depends on the
+# chunk size and not on the log. Durations go into QuantileSketch objects
+# instead of being kept and sorted.
+# Times are in seconds; events without a timestamp are left out of the
+# durations, events without a cost out of the cost totals.
+
+
+class QuantileSketch:
+    """Log-bucket quantile sketch (DDSketch style).
+
+    Positive values v fall into bucket ceil(log(v) / log(gamma)); every
+    quantile comes back within relative_accuracy of the exact value. Zero
+    (and, for clock skew, negative) values are counted apart. Count, sum,
+    min and max are exact.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = defaultdict(int)
+        self.zeros = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.add_array(np.array([value], dtype=np.float64))
+
+    def add_array(self, values):
+        if not len(values):
+            return
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        positive = values[values > 0]
+        self.zeros += len(values) - len(positive)
+        keys, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype(np.int64), return_counts=True)
+        buckets = self.buckets
+        for key, n in zip(keys.tolist(), counts.tolist()):
+            buckets[key] += n
+
+    def merge(self, other):
+        for key, n in other.buckets.items():
+            self.buckets[key] += n
+        self.zeros += other.zeros
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return min(max(0.0, self.min), self.max)
+        seen = self.zeros
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def as_dict(self, quantiles=(0.5, 0.9, 0.99)):
+        summary = {"count": self.count, "mean": self.mean,
+                   "min": self.min if self.count else None, "max": self.max if self.count else None}
+        for q in quantiles:
+            summary[f"p{round(q * 100):g}"] = self.quantile(q)
+        return summary
+
+
+class PerformanceStats:
+    def __init__(self, activities, resources, relative_accuracy=0.01):
+        self.activities = activities
+        self.resources = resources
+        self.relative_accuracy = relative_accuracy
+        self.edges = {}                 # (source, target) codes -> QuantileSketch
+        self.edge_counts = defaultdict(int)
+        self.throughput = QuantileSketch(relative_accuracy)
+        self.resource_events = np.zeros(len(resources), dtype=np.int64)
+        self.resource_costs = np.zeros(len(resources), dtype=np.int64)
+        self.activity_costs = np.zeros(len(activities), dtype=np.int64)
+        self.total_cost = 0
+        self.events = 0
+        self.cases = 0
+
+    def edge(self, source, target):
+        # QuantileSketch of the waiting times between two activity names
+        codes = {a: i for i, a in enumerate(self.activities)}
+        return self.edges.get((codes.get(source), codes.get(target)))
+
+    def dependency_graph(self, quantiles=(0.5, 0.9, 0.99)):
+        """dependency_graph_file's {source: {target: ...}} with, per edge, the
+        count and a waiting-time summary in seconds."""
+        graph = defaultdict(dict)
+        for (a, b), count in self.edge_counts.items():
+            sketch = self.edges.get((a, b))
+            timing = {"count": count, "timed": 0}
+            if sketch:
+                summary = sketch.as_dict(quantiles)
+                timing["timed"] = summary.pop("count")
+                timing.update(summary)
+            graph[self.activities[a]][self.activities[b]] = timing
+        return graph
+
+    def resource_workload(self):
+        return {r: {"events": int(self.resource_events[i]), "cost": int(self.resource_costs[i])}
+                for i, r in enumerate(self.resources)}
+
+    def activity_cost(self):
+        return {a: int(self.activity_costs[i]) for i, a in enumerate(self.activities)}
+
+    def as_dict(self, quantiles=(0.5, 0.9, 0.99)):
+        return {
+            "events": self.events,
+            "cases": self.cases,
+            "total_cost": self.total_cost,
+            "throughput_s": self.throughput.as_dict(quantiles),
+            "resources": self.resource_workload(),
+            "activity_cost": self.activity_cost(),
+            "edges": {f"{a} -> {b}": timing for a, targets in self.dependency_graph(quantiles).items()
+                      for b, timing in targets.items()},
+        }
+
+
+def _add_chunk(stats, events, ts, costs, resources, offsets):
+    # events / ts / costs / resources: the chunk's event columns; offsets:
+    # trace boundaries relative to the chunk, starting at 0
+    n_act = len(stats.activities)
+    stats.events += len(events)
+    stats.cases += len(offsets) - 1
+    if not len(events):
+        return  # only empty traces, e.g. events without a concept:name
+
+    # directly-follows pairs inside traces
+    follows = np.ones(len(events), dtype=bool)
+    follows[offsets[1:] - 1] = False
+    follows = follows[:-1]
+    src = np.flatnonzero(follows)
+    keys = events[src].astype(np.int64) * n_act + events[src + 1]
+    uniq, counts = np.unique(keys, return_counts=True)
+    for key, n in zip(uniq.tolist(), counts.tolist()):
+        stats.edge_counts[divmod(key, n_act)] += n
+
+    timed = (ts[src] != MISSING) & (ts[src + 1] != MISSING)
+    src, keys = src[timed], keys[timed]
+    waits = (ts[src + 1] - ts[src]) / 1e6
+    order = np.argsort(keys, kind="stable")
+    keys, waits = keys[order], waits[order]
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    for start, stop in zip(np.r_[0, bounds].tolist(), np.r_[bounds, len(keys)].tolist()):
+        if start == stop:
+            continue
+        edge = divmod(int(keys[start]), n_act)
+        sketch = stats.edges.get(edge)
+        if sketch is None:
+            sketch = stats.edges[edge] = QuantileSketch(stats.relative_accuracy)
+        sketch.add_array(waits[start:stop])
+
+    # throughput: last minus first timestamp of every trace with two or more
+    lengths = np.diff(offsets)
+    nonempty = offsets[:-1][lengths > 0]
+    if len(nonempty):
+        present = ts != MISSING
+        low = np.minimum.reduceat(np.where(present, ts, np.iinfo(np.int64).max), nonempty)
+        high = np.maximum.reduceat(np.where(present, ts, np.iinfo(np.int64).min), nonempty)
+        timed_cases = np.add.reduceat(present.astype(np.int64), nonempty) >= 2
+        stats.throughput.add_array((high[timed_cases] - low[timed_cases]) / 1e6)
+
+    # workload and cost
+    has_cost = costs != MISSING
+    cost = np.where(has_cost, costs, 0)
+    stats.total_cost += int(cost.sum())
+    stats.activity_costs += np.bincount(events, weights=cost, minlength=n_act).astype(np.int64)
+    known = resources >= 0
+    n_res = len(stats.resources)
+    stats.resource_events += np.bincount(resources[known], minlength=n_res)
+    stats.resource_costs += np.bincount(resources[known], weights=cost[known], minlength=n_res).astype(np.int64)
+
+
+def analyze(log, chunk_size=1 << 20, relative_accuracy=0.01):
+    """PerformanceStats of an EventLog (or a read_from_file dictionary),
+    reading about chunk_size events at a time."""
+    if not isinstance(log, EventLog):
+        log = EventLog.from_dictionary(log)
+    stats = PerformanceStats(log.activities, log.resources, relative_accuracy)
+    events = np.frombuffer(log.events, dtype=np.int32)
+    ts = np.frombuffer(log.timestamps, dtype=np.int64)
+    costs = np.frombuffer(log.costs, dtype=np.int64)
+    resources = np.frombuffer(log.event_resources, dtype=np.int32)
+    offsets = np.frombuffer(log.offsets, dtype=np.int64)
+
+    first = 0
+    while first < len(offsets) - 1:
+        # whole traces, at least one per chunk
+        last = int(np.searchsorted(offsets, offsets[first] + chunk_size, side="right")) - 1
+        last = min(max(last, first + 1), len(offsets) - 1)
+        lo, hi = int(offsets[first]), int(offsets[last])
+        _add_chunk(stats, events[lo:hi], ts[lo:hi], costs[lo:hi], resources[lo:hi],
+                   offsets[first:last + 1] - lo)
+        first = last
+    return stats
+
+
+def timed_dependency_graph(log, quantiles=(0.5, 0.9, 0.99), **kwargs):
+    # dependency_graph_file with waiting-time annotations per edge
+    return analyze(log, **kwargs).dependency_graph(quantiles)
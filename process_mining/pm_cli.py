@@ -0,0 +1,189 @@
+"""Command-line entry point of the mining pipeline.
+
+    pm parse LOG [LOG ...]                     traces, events, variants per log
+    pm dfg LOG [LOG ...] [--timing] [--json]   directly-follows graph
+    pm alpha LOG [--extended] [-o MODEL]       mine a Petri net (.pmnet / .pnml)
+    pm fitness (--model MODEL | --mine LOG) LOG [LOG ...]
+
+Logs are XES files or EventLog / variant files (.pmlog, see log_cache and
+model_io). fitness mines (or loads) the model once and replays every log
+against it in the same process.
+"""
+import sys
+
+# ---- lazy loading ----
+# Nothing heavy is imported at start-up, argparse only once the command line
+# is parsed. Every subcommand imports the modules it needs when it runs, so
+# `pm --help` or `pm parse` never pay for the miner, numpy (performance) or
+# multiprocessing (only loaded with --workers).
+
+LOG_SUFFIXES = (".pmlog",)
+MODEL_SUFFIXES = (".pmnet",)
+
+
+def load_log(path, workers=1, cache=None):
+    """EventLog of an XES or .pmlog file, parsed with `workers` processes or
+    through a log_cache directory."""
+    if path.endswith(LOG_SUFFIXES):
+        from .log_cache import load_event_log
+        return load_event_log(path)
+    if workers != 1:
+        from .parallel_xes import read_event_log
+        return read_event_log(path, workers)
+    if cache is not None:
+        from .log_cache import LogCache
+        return LogCache(cache).load(path)
+    from .event_log import EventLog
+    return EventLog.from_xes(path)
+
+
+def load_model(path, extended=False, workers=1, cache=None):
+    # a saved net, or the alpha model of a log
+    if path.endswith(MODEL_SUFFIXES):
+        from .model_io import load_petri_net
+        return load_petri_net(path)
+    from .Process_mining_Ex_4 import alpha
+    return alpha(load_log(path, workers, cache), extended)
+
+
+# ---- subcommands ----
+
+def cmd_parse(args):
+    import time
+    for path in args.logs:
+        start = time.perf_counter()
+        log = load_log(path, args.workers, args.cache)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {len(log)} traces, {log.num_events} events, {log.num_variants} variants, "
+              f"{len(log.activities)} activities ({elapsed:.3f} s)")
+        if args.output:
+            if args.variants:
+                from .model_io import dump_variants
+                dump_variants(log, args.output)
+            else:
+                from .log_cache import dump_event_log
+                dump_event_log(log, args.output)
+    return 0
+
+
+def cmd_dfg(args):
+    from .Process_mining_Ex_2 import dependency_graph_file
+    from .event_log import MISSING
+    graphs = {}
+    for path in args.logs:
+        log = load_log(path, args.workers, args.cache)
+        if args.timing and all(ts == MISSING for ts in log.timestamps):
+            # e.g. a variants-only .pmlog
+            raise ValueError(f"{path} has no timestamps, --timing needs them")
+        graph = dependency_graph_file(log, args.timing)
+        graphs[path] = {source: dict(targets) for source, targets in graph.items()}
+    if args.json:
+        import json
+        json.dump(graphs if len(graphs) > 1 else graphs[args.logs[0]], sys.stdout, indent=2)
+        print()
+        return 0
+    for path, graph in graphs.items():
+        if len(graphs) > 1:
+            print(f"{path}:")
+        edges = [(source, target, value) for source, targets in graph.items() for target, value in targets.items()]
+        edges.sort(key=lambda edge: -(edge[2]["count"] if args.timing else edge[2]))
+        for source, target, value in edges:
+            if args.timing:
+                timing = " ".join(f"{key}={value[key]:.0f}s" for key in ("mean", "p50", "p90")
+                                  if value.get(key) is not None)
+                print(f"{source} -> {target}: {value['count']} {timing}".rstrip())
+            else:
+                print(f"{source} -> {target}: {value}")
+    return 0
+
+
+def cmd_alpha(args):
+    pn = load_model(args.log, args.extended, args.workers, args.cache)
+    arcs = sum(len(t["inputs"]) + len(t["outputs"]) for t in pn.transitions.values())
+    print(f"{args.log}: {len(pn.places)} places, {len(pn.transitions)} transitions, {arcs} arcs")
+    if args.output:
+        if args.output.endswith(".pnml"):
+            from .model_io import write_pnml
+            write_pnml(pn, args.output)
+        else:
+            from .model_io import dump_petri_net
+            dump_petri_net(pn, args.output)
+    return 0
+
+
+def cmd_fitness(args):
+    pn = load_model(args.model or args.mine, args.extended, args.workers, args.cache)
+    if args.method == "alignments":
+        from .alignments import fitness_alignments
+    elif args.workers == 1:
+        from .Process_mining_Ex_4 import fitness_token_replay
+    else:
+        from .parallel_replay import fitness_token_replay_parallel
+    for path in args.logs:
+        log = load_log(path, args.workers, args.cache)
+        if args.method == "alignments":
+            fitness, skipped = fitness_alignments(log, pn, args.workers, timeout=args.timeout)
+            note = f" ({skipped} traces over budget)" if skipped else ""
+            print(f"{path}: {fitness}{note}")
+        elif args.workers == 1:
+            print(f"{path}: {round(fitness_token_replay(log, pn), 5)}")
+        else:
+            print(f"{path}: {round(fitness_token_replay_parallel(log, pn, args.workers), 5)}")
+    return 0
+
+
+def build_parser():
+    import argparse
+    parser = argparse.ArgumentParser(prog="pm", description="Process mining on XES event logs.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--workers", type=int, default=1,
+                        help="processes for parsing (and replay); 0 = one per CPU")
+    common.add_argument("--cache", metavar="DIR", help="keep parsed XES logs in this log cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("parse", parents=[common], help="parse logs and print their size")
+    p.add_argument("logs", nargs="+", metavar="LOG")
+    p.add_argument("-o", "--output", help="write the (single) log as a .pmlog file")
+    p.add_argument("--variants", action="store_true", help="with -o, write only the variants")
+    p.set_defaults(run=cmd_parse)
+
+    p = sub.add_parser("dfg", parents=[common], help="directly-follows graph of each log")
+    p.add_argument("logs", nargs="+", metavar="LOG")
+    p.add_argument("--timing", action="store_true", help="waiting times per edge")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(run=cmd_dfg)
+
+    p = sub.add_parser("alpha", parents=[common], help="mine a Petri net with the alpha miner")
+    p.add_argument("log", metavar="LOG")
+    p.add_argument("--extended", action="store_true", help="short loops and non-free-choice places")
+    p.add_argument("-o", "--output", help="write the net (.pmnet, or .pnml for PNML)")
+    p.set_defaults(run=cmd_alpha)
+
+    p = sub.add_parser("fitness", parents=[common], help="replay logs against one model")
+    model = p.add_mutually_exclusive_group(required=True)
+    model.add_argument("--model", help="saved net (.pmnet)")
+    model.add_argument("--mine", metavar="LOG", help="mine the model from this log with alpha")
+    p.add_argument("logs", nargs="+", metavar="LOG")
+    p.add_argument("--extended", action="store_true", help="with --mine, the extended alpha miner")
+    p.add_argument("--method", choices=("token", "alignments"), default="token")
+    p.add_argument("--timeout", type=float, help="seconds per variant for alignments")
+    p.set_defaults(run=cmd_fitness)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers == 0:
+        args.workers = None  # the pools take None as one per CPU
+    if getattr(args, "output", None) and len(getattr(args, "logs", ())) > 1:
+        parser.error("-o takes a single log")
+    try:
+        return args.run(args)
+    except (OSError, ValueError) as e:
+        print(f"pm: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+from array import array
+from collections import deque
+
+from .Process_mining_Ex_4 import to_petri_net
+
+# ---- reachability graph / state-space exploration ----
+# Breadth-first exploration from the initial marking with the usual firing
+# rule (a transition needs a token on each input arc). Every marking is kept
+# once as a packed byte string (CompiledNet.pack) in a dict that numbers the
+# states; parents, depths and arcs live in flat integer arrays. Exploration
+# stops at max_states / max_depth, so memory is bounded by those limits.
+# A marking that strictly covers one of its ancestors means the places that
+# grew are unbounded; such markings are reported and not expanded further.
+
+
+class ReachabilityGraph:
+    def __init__(self, net):
+        self.net = net
+        self.states = {}          # packed marking -> state id
+        self.markings = []        # state id -> packed marking
+        self.parents = array('i')
+        self.depths = array('i')
+        self.arcs = array('i')    # (source, transition, target) triples
+        self.deadlocks = []       # dead states other than the final marking
+        self.final_states = []
+        self.unbounded = set()    # place names
+        self.complete = True      # False if a limit cut exploration short
+
+    def __len__(self):
+        return len(self.markings)
+
+    @property
+    def num_arcs(self):
+        return len(self.arcs) // 3
+
+    def marking(self, state):
+        # {place name: tokens} of a state id
+        marking = self.net.unpack(self.markings[state])
+        return {self.net.place_names[p]: v for p, v in enumerate(marking) if v}
+
+    def transition_id(self, t):
+        # arcs store transition indices, this gives the PetriNet id back
+        return self.net.transition_ids[t]
+
+
+def as_compiled(pn):
+    # Ex_4 nets compile directly, ex_1 / Ex_3 nets are copied into one first
+    return to_petri_net(pn).compile()
+
+
+def explore(pn, max_states=1_000_000, max_depth=None, store_arcs=True, detect_unbounded=True):
+    net = as_compiled(pn)
+    graph = ReachabilityGraph(net)
+    n_places = len(net.place_names)
+    # arc weights per transition, duplicate arcs need several tokens
+    pre = []
+    post = []
+    for t in range(len(net.inputs)):
+        weights = {}
+        for p in net.inputs[t]:
+            weights[p] = weights.get(p, 0) + 1
+        pre.append(tuple(weights.items()))
+        weights = {}
+        for p in net.outputs[t]:
+            weights[p] = weights.get(p, 0) + 1
+        post.append(tuple(weights.items()))
+    # only transitions consuming from a marked place can be enabled
+    consumers = [[] for _ in range(n_places)]
+    for t, weights in enumerate(pre):
+        for p, _ in weights:
+            consumers[p].append(t)
+    sourceless = [t for t, weights in enumerate(pre) if not weights]
+    final = [0] * n_places
+    if net.end >= 0:
+        final[net.end] = 1
+
+    token_sums = array('i')
+
+    def add_state(packed, parent, depth, tokens):
+        sid = len(graph.markings)
+        graph.states[packed] = sid
+        graph.markings.append(packed)
+        graph.parents.append(parent)
+        graph.depths.append(depth)
+        token_sums.append(tokens)
+        return sid
+
+    def covered_ancestor(marking, parent):
+        # first ancestor the new marking strictly covers, if any; covering
+        # needs strictly more tokens, which rules out most ancestors cheaply
+        tokens = sum(marking)
+        while parent >= 0:
+            if token_sums[parent] < tokens:
+                old = net.unpack(graph.markings[parent])
+                if all(a >= b for a, b in zip(marking, old)):
+                    return old
+            parent = graph.parents[parent]
+        return None
+
+    add_state(net.pack(net.initial), -1, 0, sum(net.initial))
+    queue = deque([0])
+    while queue:
+        sid = queue.popleft()
+        marking = net.unpack(graph.markings[sid])
+        depth = graph.depths[sid]
+        candidates = {t for p, v in enumerate(marking) if v > 0 for t in consumers[p]}
+        enabled = sorted(t for t in candidates if all(marking[p] >= w for p, w in pre[t]))
+        enabled.extend(sourceless)
+        if not enabled:
+            (graph.final_states if marking == final else graph.deadlocks).append(sid)
+            continue
+        if max_depth is not None and depth >= max_depth:
+            graph.complete = False
+            continue
+        for t in enabled:
+            new = marking[:]
+            for p, w in pre[t]:
+                new[p] -= w
+            for p, w in post[t]:
+                new[p] += w
+            packed = net.pack(new)
+            target = graph.states.get(packed)
+            if target is None:
+                if len(graph.markings) >= max_states:
+                    graph.complete = False
+                    continue
+                old = covered_ancestor(new, sid) if detect_unbounded else None
+                target = add_state(packed, sid, depth + 1, sum(new))
+                if old is None:
+                    queue.append(target)
+                else:
+                    graph.unbounded.update(net.place_names[p] for p in range(n_places) if new[p] > old[p])
+            if store_arcs:
+                graph.arcs.extend((sid, t, target))
+    return graph
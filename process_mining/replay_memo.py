@@ -0,0 +1,158 @@
+from array import array
+from collections import Counter
+from itertools import repeat
+
+from .event_log import EventLog
+from .Process_mining_Ex_4 import fitness_from_counts
+
+# ---- memoized token replay ----
+# Firing a transition during replay only depends on the current marking and
+# the transition. Every marking seen is interned once to a small integer state
+# id (its int32 bytes are the interning key, built and read back in C), and
+# each state has a row {activity name: next state}, or ~(next state * span +
+# missing tokens) for a step that adds missing tokens. A hit is one list index
+# and one dict lookup. Consumed and produced tokens do not depend on the
+# marking, so they are summed per trace in C.
+
+FINISH = -1  # row key of the final consumption step
+
+
+class TransitionCache:
+    """Bounded cache of replay steps for one PetriNet.
+
+    The cache follows pn.compile(): any add_place/add_transition/add_edge
+    (or a new initial/end marking) yields a new compiled net, and the cached
+    steps are dropped the next time the cache is used. Once it holds more
+    than maxsize steps it is emptied before the next trace.
+    """
+
+    def __init__(self, pn, maxsize=1 << 18):
+        self.pn = pn
+        self.maxsize = maxsize
+        self.hits = self.misses = self.invalidations = 0
+        self._markings = []  # state id -> marking as int32 bytes
+        self._ids = {}  # marking bytes -> state id
+        self._rows = []  # state id -> {activity name or FINISH: packed step}
+        self._size = 0
+        self._net = None
+
+    @property
+    def net(self):
+        net = self.pn.compile()
+        if net is not self._net:
+            if self._net is not None:
+                self.invalidations += 1
+            self._clear()
+            self._net = net
+            self.span = max(net.n_inputs, default=0) + 1
+            self.consumed = {name: net.n_inputs[t] for name, t in net.activity_index.items()}
+            self.produced = {name: net.n_outputs[t] for name, t in net.activity_index.items()}
+        return net
+
+    def _clear(self):
+        # in place, so replay_counts can hold on to the containers
+        self._markings.clear()
+        self._ids.clear()
+        self._rows.clear()
+        self._size = 0
+
+    def initial_state(self):
+        # state id of the initial marking, at the start of a trace; it is the
+        # first state interned
+        if self._size > self.maxsize:
+            self._clear()
+        if not self._markings:
+            self._state(array('i', self._net.initial).tobytes())
+        return 0
+
+    def _state(self, packed):
+        state = self._ids.get(packed)
+        if state is None:
+            state = self._ids[packed] = len(self._markings)
+            self._markings.append(packed)
+            self._rows.append({})
+        return state
+
+    def marking(self, state):
+        # a fresh int32 array, which CompiledNet.fire and finish accept
+        return array('i', self._markings[state])
+
+    def step(self, state, activity_name):
+        # (next state, missing); unknown activities leave the state as it is
+        result = self._rows[state].get(activity_name)
+        if result is None:
+            self.misses += 1
+            t = self._net.activity_index.get(activity_name)
+            if t is None:
+                result = state
+            else:
+                marking = self.marking(state)
+                missing = self._net.fire(marking, t)
+                result = self._state(marking.tobytes())
+                if missing:
+                    result = ~(result * self.span + missing)
+            self._rows[state][activity_name] = result
+            self._size += 1
+        else:
+            self.hits += 1
+        return (result, 0) if result >= 0 else divmod(~result, self.span)
+
+    def finish(self, state):
+        # (missing, consumed, remaining) of the final consumption
+        result = self._rows[state].get(FINISH)
+        if result is None:
+            self.misses += 1
+            result = self._rows[state][FINISH] = self._net.finish(self.marking(state))
+            self._size += 1
+        else:
+            self.hits += 1
+        return result
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": self._size,
+                "states": len(self._markings), "maxsize": self.maxsize,
+                "invalidations": self.invalidations}
+
+
+def replay_counts(log, pn, cache=None):
+    """Total (missing, consumed, produced, remaining) tokens over the log.
+    Pass the same cache to later calls to keep its entries."""
+    trace_counts = log.variant_counter() if isinstance(log, EventLog) else Counter(log)
+    if cache is None:
+        cache = TransitionCache(pn)
+    net = cache.net
+    total_m = total_c = total_p = total_r = 0
+
+    rows, span = cache._rows, cache.span
+    consumed, produced = cache.consumed.get, cache.produced.get
+    steps = 0
+    misses = cache.misses
+    for trace, count in trace_counts.items():
+        state = cache.initial_state()
+        m = 0
+        steps += len(trace) + 1
+        for activity_name in trace:
+            # hit path inlined, cache.step() handles misses
+            result = rows[state].get(activity_name)
+            if result is None:
+                state, missing = cache.step(state, activity_name)
+                m += missing
+            elif result >= 0:
+                state = result
+            else:
+                state, missing = divmod(~result, span)
+                m += missing
+        c = sum(map(consumed, trace, repeat(0)))
+        p = net.initial_tokens + sum(map(produced, trace, repeat(0)))
+        m_end, c_end, r = rows[state].get(FINISH) or cache.finish(state)
+        total_m += (m + m_end) * count
+        total_c += (c + c_end) * count
+        total_p += p * count
+        total_r += r * count
+    cache.hits += steps - (cache.misses - misses)
+    return total_m, total_c, total_p, total_r
+
+
+def fitness_token_replay_memo(log, pn, cache=None):
+    m, c, p, r = replay_counts(log, pn, cache)
+    return fitness_from_counts(float(m), float(c), float(p), float(r))
@@ -0,0 +1,99 @@
+import numpy as np
+
+from .event_log import EventLog
+from .Process_mining_Ex_4 import fitness_from_counts
+
+# ---- vectorized token replay ----
+# The net is compiled into pre/post incidence matrices (transitions x places)
+# and the markings of a batch of variants are one 2-D array, one row per
+# variant. Step k fires the k-th transition of every variant still running in
+# a single gather/scatter, so the Python loop runs once per trace position and
+# not once per event. Counting follows fitness_token_replay exactly.
+
+
+def incidence_matrices(net):
+    n_places = len(net.place_names)
+    pre = np.zeros((len(net.inputs), n_places), dtype=np.int64)
+    post = np.zeros((len(net.outputs), n_places), dtype=np.int64)
+    for t, places in enumerate(net.inputs):
+        for p in places:
+            pre[t, p] += 1
+    for t, places in enumerate(net.outputs):
+        for p in places:
+            post[t, p] += 1
+    return pre, post
+
+
+def transition_sequences(log, net):
+    # variants as transition indices; activities the net does not know are
+    # skipped by replay anyway, so they are dropped here
+    lut = np.array([net.activity_index.get(a, -1) for a in log.activities] or [-1], dtype=np.int64)
+    codes = np.frombuffer(log.variant_events, dtype=np.int32)
+    offsets = np.frombuffer(log.variant_offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+    variant_of = np.repeat(np.arange(len(lengths)), lengths)
+    tids = lut[codes]
+    keep = tids >= 0
+    return tids[keep], variant_of[keep], np.bincount(variant_of[keep], minlength=len(lengths))
+
+
+def replay_counts(log, pn, batch_size=65536):
+    """Total (missing, consumed, produced, remaining) tokens over the log,
+    weighted by variant multiplicity."""
+    if not isinstance(log, EventLog):
+        log = EventLog.from_traces(log)
+    net = pn.compile()
+    pre, post = incidence_matrices(net)
+    needs = pre > 0
+    n_in = pre.sum(axis=1)
+    n_out = post.sum(axis=1)
+    initial = np.array(net.initial, dtype=np.int64)
+
+    tids, variant_of, lengths = transition_sequences(log, net)
+    starts = np.concatenate(([0], np.cumsum(lengths)))
+    counts = np.frombuffer(log.variant_counts, dtype=np.int64)
+    totals = np.zeros(4, dtype=np.int64)
+
+    for lo in range(0, len(lengths), batch_size):
+        hi = min(lo + batch_size, len(lengths))
+        batch_len = lengths[lo:hi]
+        width = int(batch_len.max()) if hi > lo else 0
+        # padded (variant, position) matrix of transition indices, -1 = done
+        seq = np.full((hi - lo, width), -1, dtype=np.int64)
+        ev_lo, ev_hi = starts[lo], starts[hi]
+        rows = variant_of[ev_lo:ev_hi] - lo
+        cols = np.arange(ev_lo, ev_hi) - starts[variant_of[ev_lo:ev_hi]]
+        seq[rows, cols] = tids[ev_lo:ev_hi]
+
+        marking = np.tile(initial, (hi - lo, 1))
+        m = np.zeros(hi - lo, dtype=np.int64)
+        c = np.zeros(hi - lo, dtype=np.int64)
+        p = np.full(hi - lo, net.initial_tokens, dtype=np.int64)
+        for k in range(width):
+            idx = np.nonzero(seq[:, k] >= 0)[0]
+            ts = seq[idx, k]
+            current = marking[idx]
+            missing = needs[ts] & (current == 0)
+            m[idx] += missing.sum(axis=1)
+            marking[idx] = current + missing - pre[ts] + post[ts]
+            c[idx] += n_in[ts]
+            p[idx] += n_out[ts]
+
+        # final consumption from the end place
+        if net.end >= 0:
+            has_end = marking[:, net.end] > 0
+            marking[has_end, net.end] -= 1
+            c += has_end
+            m += ~has_end
+        else:
+            m += 1
+        r = np.where(marking > 0, marking, 0).sum(axis=1)
+
+        weight = counts[lo:hi]
+        totals += [(m * weight).sum(), (c * weight).sum(), (p * weight).sum(), (r * weight).sum()]
+    return tuple(int(v) for v in totals)
+
+
+def fitness_token_replay_batch(log, pn, batch_size=65536):
+    m, c, p, r = replay_counts(log, pn, batch_size)
+    return fitness_from_counts(float(m), float(c), float(p), float(r))
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+from .Process_mining_Ex_4 import fitness_from_counts
+
+# ---- online token-replay conformance ----
+# Every open case keeps a packed marking (CompiledNet.pack) and its running
+# missing/consumed/produced counts. Events are replayed as they arrive, with
+# the same rules as fitness_token_replay; closing a case applies the final
+# consumption from the end place and moves its counts into the totals.
+# Cases are kept in least-recently-active order, so idle ones are evicted
+# (closed) cheaply once max_cases or idle_timeout is exceeded.
+
+
+class StreamingConformance:
+    def __init__(self, pn, max_cases=500_000, idle_timeout=None, close_on_end=False):
+        self.net = pn.compile()
+        self.max_cases = max_cases
+        self.idle_timeout = idle_timeout
+        self.close_on_end = close_on_end
+        self.cases = OrderedDict()  # case id -> (packed marking, m, c, p, last seen)
+        self.clock = 0
+        self.total_m = self.total_c = self.total_p = self.total_r = 0
+        self.closed_cases = 0
+        self.evicted_cases = 0
+        self.events = 0
+
+    def add_event(self, case_id, activity, timestamp=None):
+        """Replay one event. timestamp is any increasing number (e.g. epoch
+        seconds) used for idle eviction; without it the event count is used."""
+        net = self.net
+        self.events += 1
+        self.clock = self.events if timestamp is None else timestamp
+        state = self.cases.pop(case_id, None)
+        if state is None:
+            marking = list(net.initial)
+            m = c = 0
+            p = net.initial_tokens
+        else:
+            packed, m, c, p, _ = state
+            marking = net.unpack(packed)
+
+        t = net.activity_index.get(activity)
+        if t is not None:
+            m += net.fire(marking, t)
+            c += net.n_inputs[t]
+            p += net.n_outputs[t]
+
+        if self.close_on_end and net.end >= 0 and marking[net.end] > 0:
+            self._finish(marking, m, c, p)
+        else:
+            self.cases[case_id] = (net.pack(marking), m, c, p, self.clock)
+        self._evict()
+
+    def add_events(self, events):
+        # iterable of (case_id, activity) or (case_id, activity, timestamp)
+        for event in events:
+            self.add_event(*event)
+
+    def close_case(self, case_id):
+        state = self.cases.pop(case_id, None)
+        if state is None:
+            return False
+        packed, m, c, p, _ = state
+        self._finish(self.net.unpack(packed), m, c, p)
+        return True
+
+    def close_all(self):
+        while self.cases:
+            self.close_case(next(iter(self.cases)))
+
+    def _finish(self, marking, m, c, p):
+        m_end, c_end, r = self.net.finish(marking)
+        self.total_m += m + m_end
+        self.total_c += c + c_end
+        self.total_p += p
+        self.total_r += r
+        self.closed_cases += 1
+
+    def _evict(self):
+        cases = self.cases
+        while len(cases) > self.max_cases:
+            self.close_case(next(iter(cases)))
+            self.evicted_cases += 1
+        if self.idle_timeout is not None:
+            while cases:
+                case_id, state = next(iter(cases.items()))
+                if self.clock - state[4] <= self.idle_timeout:
+                    break
+                self.close_case(case_id)
+                self.evicted_cases += 1
+
+    @property
+    def open_cases(self):
+        return len(self.cases)
+
+    def counts(self, include_open=False):
+        """(missing, consumed, produced, remaining) over the closed cases; with
+        include_open every open case is counted as if it was closed now."""
+        m, c, p, r = self.total_m, self.total_c, self.total_p, self.total_r
+        if include_open:
+            for packed, case_m, case_c, case_p, _ in self.cases.values():
+                m_end, c_end, case_r = self.net.finish(self.net.unpack(packed))
+                m += case_m + m_end
+                c += case_c + c_end
+                p += case_p
+                r += case_r
+        return m, c, p, r
+
+    def fitness(self, include_open=False):
+        # running global fitness, None until anything was consumed/produced
+        m, c, p, r = self.counts(include_open)
+        if not c or not p:
+            return None
+        return fitness_from_counts(float(m), float(c), float(p), float(r))
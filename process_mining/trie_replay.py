@@ -0,0 +1,99 @@
+from collections import Counter
+
+from .event_log import EventLog
+from .Process_mining_Ex_4 import fitness_from_counts
+
+# ---- prefix-tree token replay ----
+# Sorting the variants lays them out in the depth-first order of their prefix
+# trie: a variant shares with the previous one exactly their common prefix.
+# Each variant is replayed from the marking at the end of that prefix and only
+# its own suffix is fired, so a prefix shared by many variants is replayed
+# once. Markings are saved only at the depths where a later variant branches
+# off, one copy per branch point, and never reverted.
+
+
+def build_trie(trace_counts):
+    """(variants, counts, shared): the variants of the log in trie order,
+    their multiplicities and, for each, the length of the prefix it shares
+    with the previous one. The trie has sum(len(v) - shared) edges."""
+    variants = sorted(trace_counts)
+    counts = [trace_counts[v] for v in variants]
+    shared = [0] * len(variants)
+    for i in range(1, len(variants)):
+        shared[i] = common_prefix(variants[i - 1], variants[i])
+    return variants, counts, shared
+
+
+def common_prefix(a, b):
+    k, n = 0, min(len(a), len(b))
+    while k < n and a[k] == b[k]:
+        k += 1
+    return k
+
+
+def branch_depths(shared):
+    """For each variant, the depths (ascending) past its shared prefix at
+    which a later variant branches off: the falling minima of shared[i + 1:]
+    that are deeper than shared[i]."""
+    depths = [()] * len(shared)
+    minima = []  # falling minima of shared[i + 1:], the smallest at the bottom
+    for i in range(len(shared) - 1, -1, -1):
+        start = shared[i]
+        deeper = len(minima)
+        while deeper and minima[deeper - 1] > start:
+            deeper -= 1
+        depths[i] = minima[deeper:]
+        del minima[deeper:]
+        if not minima or minima[-1] < start:
+            minima.append(start)
+    return depths
+
+
+def replay_counts(log, pn):
+    """Total (missing, consumed, produced, remaining) tokens over the log."""
+    trace_counts = log.variant_counter() if isinstance(log, EventLog) else Counter(log)
+    net = pn.compile()
+    variants, counts, shared = build_trie(trace_counts)
+    activity_index = net.activity_index
+    inputs, outputs, n_inputs, n_outputs, end = net.inputs, net.outputs, net.n_inputs, net.n_outputs, net.end
+    total_m = total_c = total_p = total_r = 0
+
+    # (depth, marking, m, c, p) along the current path, deepest last
+    saved = [(0, net.initial, 0, 0, net.initial_tokens)]
+    for trace, count, start, depths in zip(variants, counts, shared, branch_depths(shared)):
+        while saved[-1][0] > start:
+            saved.pop()
+        _, marking, m, c, p = saved[-1]
+        marking = marking[:]
+        pos = start
+        for stop in depths + [None]:
+            for activity_name in trace[pos:stop]:
+                t = activity_index.get(activity_name)
+                if t is None:
+                    continue
+                # CompiledNet.fire, inlined
+                for q in inputs[t]:
+                    if marking[q] == 0:
+                        m += 1
+                        marking[q] = 1
+                for q in inputs[t]:
+                    marking[q] -= 1
+                for q in outputs[t]:
+                    marking[q] += 1
+                c += n_inputs[t]
+                p += n_outputs[t]
+            if stop is not None:
+                saved.append((stop, marking[:], m, c, p))
+                pos = stop
+        # CompiledNet.finish, without touching the marking
+        c_end = 1 if end >= 0 and marking[end] > 0 else 0
+        total_m += (m + 1 - c_end) * count
+        total_c += (c + c_end) * count
+        total_p += p * count
+        total_r += (sum(v for v in marking if v > 0) - c_end) * count
+    return total_m, total_c, total_p, total_r
+
+
+def fitness_token_replay_trie(log, pn):
+    m, c, p, r = replay_counts(log, pn)
+    return fitness_from_counts(float(m), float(c), float(p), float(r))
@@ -0,0 +1,92 @@
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+
+from . import instrument
+from .xes_time import parse_timestamp
+
+# ---- streaming XES reader ----
+# iterparse based: one trace is built at a time and cleared again once it has
+# been handed out, so memory does not grow with the size of the log.
+
+ns = "{http://www.xes-standard.org/}"
+TRACE = f"{ns}trace"
+EVENT = f"{ns}event"
+STRING = f"{ns}string"
+DATE = f"{ns}date"
+
+
+def event_from_element(event, parse_time=parse_timestamp):
+    # same attribute extraction as read_from_file in Process_mining_Ex_2.py
+    event_data = {}
+    for prop in event:
+        if prop.tag == STRING and prop.attrib['key'] == 'concept:name':
+            event_data['concept:name'] = prop.attrib['value']
+        elif prop.tag == STRING and prop.attrib['key'] == 'org:resource':
+            event_data['org:resource'] = prop.attrib['value']
+        elif prop.attrib['key'] == 'cost':
+            event_data['cost'] = int(prop.attrib['value'])
+        elif prop.tag == DATE and prop.attrib['key'] == 'time:timestamp':
+            event_data['time:timestamp'] = parse_time(prop.attrib['value'])
+    return event_data
+
+
+def iter_traces(source, parse_time=parse_timestamp):
+    """Yield (case_id, events) for every trace that has at least one event.
+
+    case_id is None when the trace has no concept:name. Events are dicts with
+    the keys read_from_file produces; events without a concept:name are dropped.
+    parse_time converts the time:timestamp strings (e.g. parse_timestamp_us
+    for epoch integers).
+    """
+    context = ET.iterparse(source, events=("start", "end"))
+    _, root = next(context)
+    depth = 0
+    events = []
+    traces = n_events = 0
+    try:
+        for action, elem in context:
+            if elem.tag == TRACE:
+                if action == "start":
+                    depth += 1
+                    events = []
+                    continue
+                depth -= 1
+                case_id = None
+                for prop in elem:
+                    if prop.tag == STRING and prop.attrib['key'] == 'concept:name':
+                        case_id = prop.attrib['value']
+                if events:
+                    traces += 1
+                    n_events += len(events)
+                    yield case_id, events
+                # drop the finished trace (and anything before it) from the tree
+                root.clear()
+            elif action == "end" and elem.tag == EVENT and depth:
+                event_data = event_from_element(elem, parse_time)
+                if 'concept:name' in event_data:
+                    events.append(event_data)
+                elem.clear()
+    finally:
+        instrument.count("xes.parse.traces", traces)
+        instrument.count("xes.parse.events", n_events)
+
+
+def read_from_file(filename):
+    # drop-in for Process_mining_Ex_2.read_from_file, duplicate case ids are merged
+    log = defaultdict(list)
+    with instrument.timer("xes.parse"):
+        for case_id, events in iter_traces(filename):
+            if case_id:
+                log[case_id].extend(events)
+    return log
+
+
+def iter_activity_traces(filename):
+    # activity tuples per trace, the shape Process_mining_Ex_4.read_from_file returns
+    for _, events in iter_traces(filename):
+        yield tuple(e['concept:name'] for e in events)
+
+
+def read_traces(filename):
+    with instrument.timer("xes.parse"):
+        return list(iter_activity_traces(filename))
@@ -0,0 +1,70 @@
+from datetime import datetime
+from functools import lru_cache
+
+# ---- XES timestamp decoding ----
+# XES writes xs:dateTime values, nearly always in the fixed layout
+# YYYY-MM-DDTHH:MM:SS[.fff...][Z|+HH:MM]. That layout is sliced directly
+# instead of going through strptime; anything else falls back to
+# datetime.fromisoformat. Like read_from_file, the offset is dropped and the
+# wall-clock time as written is kept. Timestamps repeat a lot across traces,
+# so results are memoized in a bounded LRU cache.
+
+CACHE_SIZE = 1 << 16
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def _fields(value):
+    # (year, month, day, hour, minute, second, microsecond) of the wall clock
+    if len(value) < 19 or value[4] != '-' or value[7] != '-' or value[10] not in 'Tt ' \
+            or value[13] != ':' or value[16] != ':':
+        return _fallback(value)
+    micro = 0
+    rest = value[19:]
+    if rest[:1] == '.':
+        end = 1
+        while end < len(rest) and rest[end].isdigit():
+            end += 1
+        digits = rest[1:end]
+        if not digits or len(digits) > 6:
+            return _fallback(value)
+        micro = int(digits.ljust(6, '0'))
+        rest = rest[end:]
+    # the offset is only validated, the wall-clock time is what gets kept
+    if rest not in ('', 'Z', 'z'):
+        if len(rest) not in (5, 6) or rest[0] not in '+-' or not rest[1:3].isdigit() \
+                or not rest[-2:].isdigit() or (len(rest) == 6 and rest[3] != ':'):
+            return _fallback(value)
+    return (int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19]), micro)
+
+
+def _fallback(value):
+    dt = datetime.fromisoformat(value)
+    return dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_timestamp(value):
+    """Naive datetime, the same value as
+    datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z').replace(tzinfo=None),
+    but also accepting fractional seconds."""
+    return datetime(*_fields(value))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_timestamp_us(value):
+    """Microseconds since 1970-01-01 of the same wall-clock time, the integer
+    EventLog stores (see event_log.to_micros)."""
+    year, month, day, hour, minute, second, micro = _fields(value)
+    # datetime() validates the fields; only the ordinal is used from it
+    days = datetime(year, month, day, hour, minute, second).toordinal() - EPOCH_ORDINAL
+    return ((days * 24 + hour) * 60 + minute) * 60_000_000 + second * 1_000_000 + micro
+
+
+def cache_info():
+    return {"datetime": parse_timestamp.cache_info(), "micros": parse_timestamp_us.cache_info()}
+
+
+def clear_cache():
+    parse_timestamp.cache_clear()
+    parse_timestamp_us.cache_clear()
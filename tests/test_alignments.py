@@ -0,0 +1,43 @@
+import random
+
+from process_mining.alignments import Aligner
+from process_mining.Process_mining_Ex_4 import PetriNet
+
+
+class Dijkstra(Aligner):
+    # no heuristic: plain shortest path search, optimal by construction
+    def _heuristic(self, *args):
+        return 0
+
+
+def random_net(rng):
+    pn = PetriNet()
+    n_places = rng.randint(2, 5)
+    for i in range(n_places):
+        pn.add_place(f"P{i}", 1 if i == 0 else 0)
+    for i in range(rng.randint(1, 6)):
+        pn.add_transition(rng.choice("abcde"), f"T{i}")
+        for _ in range(rng.randint(0, 2)):
+            pn.add_edge(f"P{rng.randrange(n_places)}", f"T{i}")
+        for _ in range(rng.randint(0, 2)):
+            pn.add_edge(f"T{i}", f"P{rng.randrange(n_places)}")
+    pn.start_place = "P0"
+    pn.end_place = f"P{n_places - 1}"
+    return pn
+
+
+def test_cost_matches_dijkstra():
+    tested = 0
+    for seed in range(300):
+        rng = random.Random(seed)
+        pn = random_net(rng)
+        # unbounded nets give up at max_states, A* may still succeed there
+        aligner, dijkstra = Aligner(pn, max_states=2000), Dijkstra(pn, max_states=2000)
+        for _ in range(4):
+            trace = tuple(rng.choice("abcdef") for _ in range(rng.randint(0, 6)))
+            found, expected = aligner.align(trace), dijkstra.align(trace)
+            if expected is not None:
+                assert found is not None, (seed, trace)
+                assert found.cost == expected.cost, (seed, trace)
+                tested += 1
+    assert tested > 100
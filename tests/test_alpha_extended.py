@@ -0,0 +1,91 @@
+import os
+
+from process_mining.alpha_places import extended_places, footprint_pairs
+from process_mining.footprint import Footprint
+from process_mining.Process_mining_Ex_4 import alpha, fitness_token_replay, read_from_file
+
+from conftest import ROOT
+
+
+def places(*traces):
+    # extended_places of the log with activities as single letters, sets as
+    # sorted strings
+    fp = Footprint.from_traces([tuple(t) for t in traces], extended=True)
+    pairs, starts, ends, loops = extended_places(fp)
+    key = lambda p: p if isinstance(p, str) else (letters(p[0]), letters(p[1]))
+    return ({key(p) for p in pairs}, "".join(starts), "".join(ends),
+            {a: sorted(map(key, keys)) for a, keys in loops.items()})
+
+
+def letters(names):
+    return "".join(sorted(names))
+
+
+def fitness(*traces, extended=True):
+    log = [tuple(t) for t in traces]
+    return fitness_token_replay(log, alpha(log, extended))
+
+
+# ---- length-1 loops ----
+
+def test_one_loop_between_places():
+    assert places("ac", "abc", "abbc") == ({("a", "c")}, "a", "c", {"b": [("a", "c")]})
+    assert fitness("ac", "abc", "abbc") == 1.0
+
+
+def test_one_loop_opening_traces():
+    # c follows both the a loop on the start place and b: the place (b, c)
+    # is folded into the start place, b loops on it
+    assert places("aacd", "bce") == ({("b", "e"), ("c", "de")}, "c", "de",
+                                     {"a": ["start"], "b": ["start"]})
+    assert fitness("aacd", "bce") == 1.0
+
+
+def test_one_loop_closing_traces():
+    assert places("dcaa", "ecb") == ({("de", "c")}, "de", "c", {"a": ["end"], "b": ["end"]})
+    assert fitness("dcaa", "ecb") == 1.0
+
+
+def test_one_loop_on_start_place():
+    assert places("aab", "b") == (set(), "b", "b", {"a": ["start"]})
+    assert fitness("aab", "b") == 1.0
+
+
+def test_rare_repeat_is_not_a_loop():
+    # a duplicated event in one trace out of twenty
+    traces = ["abc"] * 19 + ["abbc"]
+    pairs, _, _, loops = places(*traces)
+    assert loops == {}
+    assert pairs == {("a", "b"), ("b", "c")}
+
+
+# ---- length-2 loops ----
+
+def test_two_loop():
+    assert places("ad", "abcd", "abcbcd") == ({("ac", "bd"), ("b", "c")}, "a", "d", {})
+    assert fitness("ad", "abcd", "abcbcd", extended=False) < 1.0
+    assert fitness("ad", "abcd", "abcbcd") == 1.0
+
+
+# ---- non-free-choice ----
+
+def test_decided_choice():
+    pairs, starts, ends, loops = places("acd", "bce")
+    assert pairs == {("ab", "c"), ("c", "de"), ("a", "d"), ("b", "e")}
+    assert (starts, ends, loops) == ("ab", "de", {})
+    # the standard miner lets a be followed by e
+    standard = footprint_pairs(Footprint.from_traces([tuple("acd"), tuple("bce")]))
+    assert {(letters(a), letters(b)) for a, b in standard} == {("ab", "c"), ("c", "de")}
+    assert fitness("acd", "bce") == 1.0
+
+
+def test_bundled_log_needs_no_hand_made_places():
+    # the places Ex_4 used to add by hand: the choice after inspection and
+    # the join before issue completion
+    log = read_from_file(os.path.join(ROOT, "extension-log-4.xes"))
+    pairs = footprint_pairs(Footprint.from_traces(log))
+    assert (frozenset({"inspection"}), frozenset({"action not required", "intervention authorization"})) in pairs
+    assert (frozenset({"action not required", "work completion", "no concession"}),
+            frozenset({"issue completion"})) in pairs
+    assert extended_places(Footprint.from_traces(log, extended=True))[0] == pairs
+    assert fitness_token_replay(log, alpha(log, extended=True)) == 1.0
@@ -0,0 +1,35 @@
+import itertools
+import random
+
+from process_mining.alpha_places import footprint_pairs, maximal_pairs
+from process_mining.footprint import Footprint
+
+
+def relations(log):
+    activities = sorted({a for trace in log for a in trace})
+    follows = {(t[i], t[i + 1]) for t in log for i in range(len(t) - 1)}
+    causality = {(a, b) for a, b in follows if (b, a) not in follows}
+    choice = {(a, b) for a in activities for b in activities
+              if (a, b) not in follows and (b, a) not in follows}
+    return activities, causality, choice
+
+
+def powerset_pairs(activities, causality, choice):
+    # step 3 + 4 as Ex_4 first did them: every pair of subsets
+    subsets = [frozenset(s) for r in range(1, len(activities) + 1)
+               for s in itertools.combinations(activities, r)]
+    unrelated = lambda s: all((x, y) in choice for x, y in itertools.combinations(s, 2))
+    y_sets = {(A, B) for A in subsets if unrelated(A) for B in subsets
+              if unrelated(B) and all((a, b) in causality for a in A for b in B)}
+    return {(A, B) for A, B in y_sets
+            if not any(A <= A2 and B <= B2 and (A, B) != (A2, B2) for A2, B2 in y_sets)}
+
+
+def test_pairs_match_powerset():
+    rng = random.Random(1)
+    for _ in range(400):
+        acts = "abcdefg"[:rng.randint(1, 7)]
+        log = [tuple(rng.choice(acts) for _ in range(rng.randint(1, 6))) for _ in range(rng.randint(1, 6))]
+        expected = powerset_pairs(*relations(log))
+        assert footprint_pairs(Footprint.from_traces(log)) == expected, log
+        assert maximal_pairs(*relations(log)) == expected, log
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from process_mining.event_log import EventLog
+from process_mining.log_generator import write_xes
+
+
+def test_write_xes_long_traces(tmp_path):
+    # past 24 * 31 events the day of month used to overflow
+    path = tmp_path / "long.xes"
+    trace = [f"a{i % 7}" for i in range(1000)]
+    assert write_xes(str(path), [trace, trace[:3]]) == 1003
+    log = EventLog.from_xes(str(path))
+    assert log.trace(0) == tuple(trace)
+    first = log.event_dict(0)["time:timestamp"]
+    last = log.event_dict(999)["time:timestamp"]
+    assert last - first == timedelta(hours=999)
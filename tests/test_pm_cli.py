@@ -0,0 +1,21 @@
+import os
+
+from process_mining.pm_cli import main
+
+from conftest import ROOT
+
+LOG = os.path.join(ROOT, "extension-log-4.xes")
+
+
+def test_dfg_timing(capsys):
+    assert main(["dfg", LOG, "--timing"]) == 0
+    assert "record issue -> inspection: 1000 mean=3600s" in capsys.readouterr().out
+
+
+def test_dfg_timing_needs_timestamps(tmp_path, capsys):
+    variants = str(tmp_path / "variants.pmlog")
+    assert main(["parse", LOG, "-o", variants, "--variants"]) == 0
+    assert main(["dfg", variants]) == 0
+    capsys.readouterr()
+    assert main(["dfg", variants, "--timing"]) == 1
+    assert "has no timestamps" in capsys.readouterr().err
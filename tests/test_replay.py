@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from process_mining.event_log import EventLog
+from process_mining.Process_mining_Ex_4 import PetriNet, fitness_token_replay
+from process_mining.replay_memo import TransitionCache, fitness_token_replay_memo
+from process_mining.streaming_conformance import StreamingConformance
+from process_mining.trie_replay import fitness_token_replay_trie
+
+SEEDS = range(300)
+
+
+def random_net(rng):
+    # small nets with duplicate labels, duplicate arcs, sources, sinks and
+    # sometimes no end place
+    pn = PetriNet()
+    n_places = rng.randint(1, 5)
+    for i in range(n_places):
+        pn.add_place(f"P{i}", 1 if i == 0 else rng.choice([0, 0, 0, 1]))
+    for i in range(rng.randint(1, 5)):
+        pn.add_transition(rng.choice("abcde"), f"T{i}")
+        for _ in range(rng.randint(0, 3)):
+            pn.add_edge(f"P{rng.randrange(n_places)}", f"T{i}")
+        for _ in range(rng.randint(0, 3)):
+            pn.add_edge(f"T{i}", f"P{rng.randrange(n_places)}")
+    pn.start_place = "P0"
+    pn.end_place = f"P{rng.randrange(n_places)}" if rng.random() < 0.9 else None
+    return pn
+
+
+def random_log(rng):
+    # "f" is not in any net
+    return [tuple(rng.choice("abcdef") for _ in range(rng.randint(1, 6))) for _ in range(rng.randint(1, 8))]
+
+
+def reference_fitness(log, pn):
+    # token replay as Ex_4 first did it, on the PetriNet dictionaries
+    total_m = total_c = total_p = total_r = 0
+    for trace in log:
+        marking = dict(pn.initial_marking)
+        m = c = 0
+        p = sum(marking.values())
+        for name in trace:
+            tids = sorted(tid for tid, t in pn.transitions.items() if t["name"] == name)
+            if not tids:
+                continue
+            t = pn.transitions[tids[0]]
+            inputs, outputs = sorted(t["inputs"]), sorted(t["outputs"])
+            for place in inputs:
+                if marking.get(place, 0) == 0:
+                    m += 1
+                    marking[place] = 1
+            for place in inputs:
+                marking[place] -= 1
+            for place in outputs:
+                marking[place] = marking.get(place, 0) + 1
+            c += len(inputs)
+            p += len(outputs)
+        if marking.get(pn.end_place, 0) > 0:
+            c += 1
+            marking[pn.end_place] -= 1
+        else:
+            m += 1
+        total_m += m
+        total_c += c
+        total_p += p
+        total_r += sum(v for v in marking.values() if v > 0)
+    return round(0.5 * (1 - total_m / total_c) + 0.5 * (1 - total_r / total_p), 5)
+
+
+def outcome(fn, *args):
+    try:
+        return fn(*args)
+    except ZeroDivisionError:
+        return ZeroDivisionError
+
+
+def streaming_fitness(log, pn):
+    sc = StreamingConformance(pn)
+    for case, trace in enumerate(log):
+        for name in trace:
+            sc.add_event(case, name)
+    sc.close_all()
+    result = sc.fitness()
+    if result is None:
+        raise ZeroDivisionError
+    return result
+
+
+def memo_fitness(log, pn):
+    # a tiny cache, so it is cleared between traces as well
+    return fitness_token_replay_memo(log, pn, TransitionCache(pn, maxsize=2))
+
+
+REPLAYS = {
+    "compiled": fitness_token_replay,
+    "event log": lambda log, pn: fitness_token_replay(EventLog.from_traces(log), pn),
+    "trie": fitness_token_replay_trie,
+    "memo": memo_fitness,
+    "streaming": streaming_fitness,
+}
+
+
+@pytest.mark.parametrize("name", sorted(REPLAYS))
+def test_replay_matches_reference(name):
+    replay = REPLAYS[name]
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        pn = random_net(rng)
+        log = random_log(rng)
+        assert outcome(replay, log, pn) == outcome(reference_fitness, log, pn), seed
+
+
+def test_numpy_replay_matches_reference():
+    replay_numpy = pytest.importorskip("process_mining.replay_numpy")
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        pn = random_net(rng)
+        log = random_log(rng)
+        got = outcome(replay_numpy.fitness_token_replay_batch, log, pn, 3)
+        assert got == outcome(reference_fitness, log, pn), seed
+
+
+def test_memo_cache_is_reused():
+    rng = random.Random(0)
+    pn = random_net(rng)
+    log = [tuple("abcab"), tuple("abc")] * 3
+    cache = TransitionCache(pn)
+    first = fitness_token_replay_memo(log, pn, cache)
+    misses = cache.misses
+    assert fitness_token_replay_memo(log, pn, cache) == first
+    assert cache.misses == misses